@@ -0,0 +1,42 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, callers keep their own interpreted path when it is missing
+    njit = None
+
+
+def _fill(content, width: int, height: int, start: int, visited):
+    """Depth-first flood fill over flat cell indices, marks every opened cell in visited"""
+    visited[start] = 1
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        if content[i] != 0:
+            continue
+        x = i // height
+        y = i % height
+        for dx in range(-1, 2):
+            nx = x + dx
+            if nx < 0 or nx >= width:
+                continue
+            for dy in range(-1, 2):
+                ny = y + dy
+                if ny < 0 or ny >= height:
+                    continue
+                j = nx * height + ny
+                if not visited[j]:
+                    visited[j] = 1
+                    stack.append(j)
+
+
+if njit is not None:
+    _fill = njit(cache=True, nogil=True)(_fill)
+
+
+def flood_fill(content: np.ndarray, x: int, y: int) -> np.ndarray:
+    """Return a (width, height) bool mask of the cells opened by revealing the empty cell (x, y)"""
+    width, height = content.shape
+    visited = np.zeros(width * height, np.uint8)
+    _fill(content.reshape(-1), width, height, x * height + y, visited)
+    return visited.view(bool).reshape(width, height)
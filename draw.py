@@ -1,3 +1,5 @@
+import functools
+
 import pygame
 import pygame.image
 from pygame import Surface
@@ -25,81 +27,125 @@ tile_flag: Surface
 tile_false_flag: Surface
 tiles: list[pygame.Surface]
 
+_font18: pygame.font.Font
+_font16: pygame.font.Font
+_font14: pygame.font.Font
+
+
+# All sprites live in one atlas surface, the globals above are subsurfaces of it
+_atlas: Surface = None
+_atlas_rects: dict[str, pygame.Rect] = {}
+_tile_areas: list[pygame.Rect] = []  # atlas areas of `tiles`, indexed by cell contents
+ATLAS_WIDTH = 256
+
+_SPRITE_NAMES = (
+    'border_top_left', 'border_top_right', 'border_top_mid', 'border_top_fill',
+    'border_left', 'border_right', 'border_bottom_left', 'border_bottom', 'border_bottom_right',
+    'face_n', 'face_c', 'face_o', 'face_x',
+    *(f'number_{i}' for i in range(10)),
+    'tile_hidden', 'tile_flag', 'tile_false_flag',
+    *(f'tile_{i}' for i in range(9)), 'tile_boom', 'tile_mine',
+)
+
 
 def load_assets():
+    global _atlas, _atlas_rects, _tile_areas
+    # Converting to the display pixel format up front keeps every later blit on SDL's fast path,
+    # which is why this can only run once a display mode has been set
+    images = {name: pygame.image.load(f'assets/{name}.png').convert_alpha() for name in _SPRITE_NAMES}
+    _atlas, _atlas_rects = pack_atlas(images)
+
+    def sprite(name: str) -> Surface:
+        return _atlas.subsurface(_atlas_rects[name])
+
     global border_tl, border_tr, border_tm, border_tf, border_l, border_r, border_bl, border_b, border_br
-    border_tl = pygame.image.load('assets/border_top_left.png')
-    border_tr = pygame.image.load('assets/border_top_right.png')
-    border_tm = pygame.image.load('assets/border_top_mid.png')
-    border_tf = pygame.image.load('assets/border_top_fill.png')
+    border_tl = sprite('border_top_left')
+    border_tr = sprite('border_top_right')
+    border_tm = sprite('border_top_mid')
+    border_tf = sprite('border_top_fill')
 
-    border_l = pygame.image.load('assets/border_left.png')
-    border_r = pygame.image.load('assets/border_right.png')
-    border_bl = pygame.image.load('assets/border_bottom_left.png')
-    border_b = pygame.image.load('assets/border_bottom.png')
-    border_br = pygame.image.load('assets/border_bottom_right.png')
+    border_l = sprite('border_left')
+    border_r = sprite('border_right')
+    border_bl = sprite('border_bottom_left')
+    border_b = sprite('border_bottom')
+    border_br = sprite('border_bottom_right')
 
     global face_normal, face_cool, face_oh, face_dead
-    face_normal = pygame.image.load('assets/face_n.png')
-    face_cool = pygame.image.load('assets/face_c.png')
-    face_oh = pygame.image.load('assets/face_o.png')
-    face_dead = pygame.image.load('assets/face_x.png')
+    face_normal = sprite('face_n')
+    face_cool = sprite('face_c')
+    face_oh = sprite('face_o')
+    face_dead = sprite('face_x')
 
     global numbers
-    numbers = [
-        pygame.image.load('assets/number_0.png'),
-        pygame.image.load('assets/number_1.png'),
-        pygame.image.load('assets/number_2.png'),
-        pygame.image.load('assets/number_3.png'),
-        pygame.image.load('assets/number_4.png'),
-        pygame.image.load('assets/number_5.png'),
-        pygame.image.load('assets/number_6.png'),
-        pygame.image.load('assets/number_7.png'),
-        pygame.image.load('assets/number_8.png'),
-        pygame.image.load('assets/number_9.png'),
-    ]
+    numbers = [sprite(f'number_{i}') for i in range(10)]
+    get_number_surface.cache_clear()
 
     global tile_hidden, tile_flag, tile_false_flag, tiles
-    tile_hidden = pygame.image.load('assets/tile_hidden.png')
-    tile_flag = pygame.image.load('assets/tile_flag.png')
-    tile_false_flag = pygame.image.load('assets/tile_false_flag.png')
-    tiles = [
-        pygame.image.load('assets/tile_0.png'),
-        pygame.image.load('assets/tile_1.png'),
-        pygame.image.load('assets/tile_2.png'),
-        pygame.image.load('assets/tile_3.png'),
-        pygame.image.load('assets/tile_4.png'),
-        pygame.image.load('assets/tile_5.png'),
-        pygame.image.load('assets/tile_6.png'),
-        pygame.image.load('assets/tile_7.png'),
-        pygame.image.load('assets/tile_8.png'),
-        pygame.image.load('assets/tile_boom.png'),
-        pygame.image.load('assets/tile_mine.png'),
-    ]
+    tile_hidden = sprite('tile_hidden')
+    tile_flag = sprite('tile_flag')
+    tile_false_flag = sprite('tile_false_flag')
+    tile_names = [f'tile_{i}' for i in range(9)] + ['tile_boom', 'tile_mine']
+    tiles = [sprite(name) for name in tile_names]
+    _tile_areas = [_atlas_rects[name] for name in tile_names]
+
+    global _font18, _font16, _font14
+    pygame.font.init()
+    _font18 = pygame.font.Font(None, 18)
+    _font16 = pygame.font.Font(None, 16)
+    _font14 = pygame.font.Font(None, 14)
+    get_hint_popup_surface.cache_clear()
+    get_hint_counter_surface.cache_clear()
+
+
+def pack_atlas(images: dict[str, Surface]) -> tuple[Surface, dict[str, pygame.Rect]]:
+    """Pack images into rows of a single surface, tallest first"""
+    rects = {}
+    x = y = row_height = 0
+    for name in sorted(images, key=lambda n: images[n].get_height(), reverse=True):
+        w, h = images[name].get_size()
+        if x + w > ATLAS_WIDTH:
+            x, y = 0, y + row_height
+            row_height = 0
+        rects[name] = pygame.Rect(x, y, w, h)
+        x += w
+        row_height = max(row_height, h)
+
+    atlas = pygame.Surface((ATLAS_WIDTH, y + row_height), pygame.SRCALPHA).convert_alpha()
+    for name, rect in rects.items():
+        atlas.blit(images[name], rect)
+    return atlas, rects
 
 
 _screen: pygame.Surface = None
 _background: pygame.Surface = None
+_hidden_layer: pygame.Surface = None
+_full_redraw: bool = True
+_popup_visible: bool = False
+# Window size and the face position derived from it, updated by set_screen()
+_scr_w: int = 0
+_scr_h: int = 0
+_face_pos: tuple[int, int] = (0, 7)
 
 
 def set_screen(field_width: int, field_height: int):
-    global _screen
+    global _screen, _scr_w, _scr_h, _face_pos
     scr_w, scr_h = field_width * 16 + 4 * 2, field_height * 16 + 44
 
-    if _screen is not None:
-        w, h = _screen.get_size()
-        if scr_w == w and scr_h == h:
-            return
+    if _screen is not None and scr_w == _scr_w and scr_h == _scr_h:
+        return
     _screen = pygame.display.set_mode((scr_w, scr_h), pygame.SCALED | pygame.RESIZABLE)
+    _scr_w, _scr_h = scr_w, scr_h
+    _face_pos = scr_w // 2 - 11, 7
+    if _atlas is None:
+        load_assets()
     prepare_background(field_width, field_height)
 
 
 def prepare_background(field_width: int, field_height: int):
     global _background
-    if _background is None:
-        _background = pygame.Surface(_screen.get_size())
-
-    scr_w, scr_h = _screen.get_size()
+    scr_w, scr_h = _scr_w, _scr_h
+    if _background is None or _background.get_size() != (scr_w, scr_h):
+        _background = pygame.Surface((scr_w, scr_h)).convert()
 
     # corners
     _background.blit(border_tl, (0, 0))
@@ -108,62 +154,161 @@ def prepare_background(field_width: int, field_height: int):
     _background.blit(border_br, (scr_w - 4, scr_h - 4))
 
     # left and right sides
-    for y in range(field_height):
-        _background.blit(border_l, (0, y * 16 + 40))
-        _background.blit(border_r, (scr_w - 4, y * 16 + 40))
+    if field_height > 0:
+        _background.blit(_tile_strip(border_l, field_height, vertical=True), (0, 40))
+        _background.blit(_tile_strip(border_r, field_height, vertical=True), (scr_w - 4, 40))
 
     # bottom and top fillers
-    for x in range(field_width):
-        _background.blit(border_b, (x * 16 + 4, scr_h - 4))
-        if 3 <= x < field_width - 3:
-            _background.blit(border_tf, (x * 16 + 4, 0))
+    if field_width > 0:
+        _background.blit(_tile_strip(border_b, field_width), (4, scr_h - 4))
+    if field_width > 6:
+        _background.blit(_tile_strip(border_tf, field_width - 6), (3 * 16 + 4, 0))
 
     # a place for the face
     _background.blit(border_tm, (scr_w // 2 - 16, 0))
 
+    prepare_hidden_layer(field_width, field_height)
+
+
+def _tile_strip(tile: pygame.Surface, count: int, vertical: bool = False) -> pygame.Surface:
+    """Repeat a border tile count times along one axis, so a whole side is drawn with one blit"""
+    tile_w, tile_h = tile.get_size()
+    if vertical:
+        size, step = (tile_w, tile_h * count), (0, tile_h)
+    else:
+        size, step = (tile_w * count, tile_h), (tile_w, 0)
+    strip = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+    strip.blits([(tile, (i * step[0], i * step[1])) for i in range(count)], doreturn=False)
+    return strip
+
+
+def prepare_hidden_layer(field_width: int, field_height: int):
+    """Pre-render the whole playfield as hidden tiles so it can be drawn with one blit"""
+    global _hidden_layer
+    _hidden_layer = pygame.Surface((field_width * 16, field_height * 16)).convert()
+    for x in range(field_width):
+        for y in range(field_height):
+            _hidden_layer.blit(tile_hidden, (x * 16, y * 16))
+
+
+def invalidate():
+    """Make the next draw_screen() call repaint the whole window"""
+    global _full_redraw
+    _full_redraw = True
+
+
+def draw_screen(dirty_cells: set[tuple[int, int]] = frozenset()) -> list[pygame.Rect]:
+    """Draw what changed since the previous frame and return the updated screen areas"""
+    global _full_redraw, _popup_visible
+
+    popup_visible = field.show_hint_popup()
+    if _full_redraw or popup_visible or _popup_visible:
+        # The popup darkens the whole window, so it is drawn (and removed) with a full repaint
+        _full_redraw = False
+        _popup_visible = popup_visible
+        draw_borders(_screen)
+        draw_field(_screen)
+        draw_hud(_screen)
+        draw_hint_popup(_screen)
+        return [_screen.get_rect()]
+
+    rects = draw_cells(_screen, dirty_cells)
+    rects.append(draw_hud(_screen))
+    return rects
+
 
-def draw_screen():
-    draw_borders(_screen)
-    draw_field(_screen)
-    draw_mine_count(_screen)
-    draw_timer(_screen)
-    draw_face(_screen)
-    draw_hint_counter(_screen)
-    draw_hint_popup(_screen)
+def draw_hud(screen: pygame.Surface) -> pygame.Rect:
+    hud_rect = pygame.Rect(0, 0, screen.get_width(), 40)
+    screen.blit(_background, hud_rect, hud_rect)
+    draw_mine_count(screen)
+    draw_timer(screen)
+    draw_face(screen)
+    draw_hint_counter(screen)
+    return hud_rect
 
 
 def draw_borders(screen: pygame.Surface):
     screen.blit(_background, (0, 0))
 
 
+def _blit_batch(screen: pygame.Surface, sequence: list):
+    # Surface.fblits() has no source-area argument, so atlas batches go through blits()
+    if sequence:
+        screen.blits(sequence, doreturn=False)
+
+
 def draw_field(screen: pygame.Surface):
     w, h = field.get_field_width(), field.get_field_height()
     hint_cell = field.get_hint_cell()
+    preview_set = field.get_preview_set()
+
+    # Every hidden cell is covered by the pre-rendered layer,
+    # only cells that look different need to be drawn on top of it
+    screen.blit(_hidden_layer, (4, 40))
+
+    # Every tile comes from the atlas, so the whole field is drawn with a single batched call
+    flag_area = _atlas_rects['tile_flag']
+    false_flag_area = _atlas_rects['tile_false_flag']
+    sequence = []
+    hint_rects = []
 
     for x in range(w):
         for y in range(h):
             contents, state = field.get_cell_state(x, y)
             pos = x * 16 + 4, y * 16 + 40
 
-            # Check if this is the hint cell
-            is_hint = hint_cell is not None and hint_cell == (x, y)
-
             if state == 0:
-                if field.in_preview(x, y):
-                    screen.blit(tiles[0], pos)  # preview hidden
-                else:
-                    screen.blit(tile_hidden, pos)  # normal hidden
-
-                # Draw hint highlight (yellow border)
-                if is_hint:
-                    hint_rect = pygame.Rect(pos[0], pos[1], 16, 16)
-                    pygame.draw.rect(screen, (255, 255, 0), hint_rect, 2)
+                if (x, y) in preview_set:
+                    sequence.append((_atlas, pos, _tile_areas[0]))  # preview hidden
+
+                # Check if this is the hint cell
+                if hint_cell is not None and hint_cell == (x, y):
+                    hint_rects.append(pygame.Rect(pos[0], pos[1], 16, 16))
             elif state == 2:
-                screen.blit(tile_flag, pos)
+                sequence.append((_atlas, pos, flag_area))
             elif state == 3:
-                screen.blit(tile_false_flag, pos)
+                sequence.append((_atlas, pos, false_flag_area))
             else:
-                screen.blit(tiles[contents], pos)
+                sequence.append((_atlas, pos, _tile_areas[contents]))
+
+    _blit_batch(screen, sequence)
+
+    # Draw hint highlight (yellow border) on top of the tiles
+    for hint_rect in hint_rects:
+        pygame.draw.rect(screen, (255, 255, 0), hint_rect, 2)
+
+
+def draw_cells(screen: pygame.Surface, cells: set[tuple[int, int]]) -> list[pygame.Rect]:
+    hint_cell = field.get_hint_cell()
+    preview_set = field.get_preview_set()
+    hidden_area = _atlas_rects['tile_hidden']
+    flag_area = _atlas_rects['tile_flag']
+    false_flag_area = _atlas_rects['tile_false_flag']
+
+    sequence = []
+    rects = []
+    hint_rects = []
+    for x, y in cells:
+        contents, state = field.get_cell_state(x, y)
+        pos = x * 16 + 4, y * 16 + 40
+        rect = pygame.Rect(pos[0], pos[1], 16, 16)
+
+        if state == 0:
+            sequence.append((_atlas, pos, _tile_areas[0] if (x, y) in preview_set else hidden_area))
+            if hint_cell is not None and hint_cell == (x, y):
+                hint_rects.append(rect)
+        elif state == 2:
+            sequence.append((_atlas, pos, flag_area))
+        elif state == 3:
+            sequence.append((_atlas, pos, false_flag_area))
+        else:
+            sequence.append((_atlas, pos, _tile_areas[contents]))
+        rects.append(rect)
+
+    _blit_batch(screen, sequence)
+    for hint_rect in hint_rects:
+        pygame.draw.rect(screen, (255, 255, 0), hint_rect, 2)
+    return rects
 
 
 def draw_mine_count(screen: pygame.Surface):
@@ -171,21 +316,27 @@ def draw_mine_count(screen: pygame.Surface):
 
 
 def draw_timer(screen: pygame.Surface):
-    scr_w, _ = screen.get_size()
-    draw_number(screen, field.get_time(), scr_w - 45, 9)
+    draw_number(screen, field.get_time(), _scr_w - 45, 9)
 
 
 def draw_number(screen: pygame.Surface, number: int, x: int, y: int):
-    screen.blit(numbers[number % 10], (x + 26, y))
+    screen.blit(get_number_surface(number), (x, y))
+
+
+@functools.lru_cache(maxsize=256)
+def get_number_surface(number: int) -> pygame.Surface:
+    """Compose the up to 3 digit sprites of a counter into one surface"""
+    surface = pygame.Surface((36, 18), pygame.SRCALPHA).convert_alpha()
+    surface.blit(numbers[number % 10], (26, 0))
     if number > 9:
-        screen.blit(numbers[(number // 10) % 10], (x + 13, y))
+        surface.blit(numbers[(number // 10) % 10], (13, 0))
     if number > 99:
-        screen.blit(numbers[(number // 100) % 10], (x, y))
+        surface.blit(numbers[(number // 100) % 10], (0, 0))
+    return surface
 
 
 def draw_face(screen: pygame.Surface):
-    scr_w, _ = screen.get_size()
-    pos = scr_w // 2 - 11, 7
+    pos = _face_pos
     if field.game_over():
         screen.blit(face_dead, pos)
     elif field.game_won():
@@ -197,8 +348,8 @@ def draw_face(screen: pygame.Surface):
 
 
 def is_face(x: int, y: int) -> bool:
-    scr_w, _ = _screen.get_size()
-    return scr_w // 2 - 11 <= x < scr_w // 2 + 11 and 7 <= y < 29
+    face_x, face_y = _face_pos
+    return face_x <= x < face_x + 22 and face_y <= y < face_y + 22
 
 
 def draw_hint_popup(screen: pygame.Surface):
@@ -206,41 +357,53 @@ def draw_hint_popup(screen: pygame.Surface):
     if not field.show_hint_popup():
         return
 
-    scr_w, scr_h = screen.get_size()
+    scr_w, scr_h = _scr_w, _scr_h
 
     # Semi-transparent overlay
-    overlay = pygame.Surface((scr_w, scr_h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 128))
-    screen.blit(overlay, (0, 0))
+    screen.blit(get_overlay_surface((scr_w, scr_h)), (0, 0))
 
     # Popup box
+    popup = get_hint_popup_surface(field.get_hints_remaining())
+    popup_w, popup_h = popup.get_size()
+    screen.blit(popup, ((scr_w - popup_w) // 2, (scr_h - popup_h) // 2))
+
+
+@functools.lru_cache(maxsize=1)
+def get_overlay_surface(size: tuple[int, int]) -> pygame.Surface:
+    overlay = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+    overlay.fill((0, 0, 0, 128))
+    return overlay
+
+
+@functools.lru_cache(maxsize=8)
+def get_hint_popup_surface(hints: int) -> pygame.Surface:
+    """Render the whole hint popup box with its text for the given hint count"""
     popup_w, popup_h = 200, 100
-    popup_x = (scr_w - popup_w) // 2
-    popup_y = (scr_h - popup_h) // 2
+    popup = pygame.Surface((popup_w, popup_h)).convert()
 
-    pygame.draw.rect(screen, (200, 200, 200), (popup_x, popup_y, popup_w, popup_h))
-    pygame.draw.rect(screen, (0, 0, 0), (popup_x, popup_y, popup_w, popup_h), 2)
+    pygame.draw.rect(popup, (200, 200, 200), (0, 0, popup_w, popup_h))
+    pygame.draw.rect(popup, (0, 0, 0), (0, 0, popup_w, popup_h), 2)
 
     # Text
-    font = pygame.font.Font(None, 18)
-    font_small = pygame.font.Font(None, 16)
-
-    text1 = font.render("Sorry! No logical", True, (0, 0, 0))
-    text2 = font.render("moves available.", True, (0, 0, 0))
-    text3 = font_small.render(f"Hints left: {field.get_hints_remaining()}", True, (100, 0, 0))
-    text4 = font_small.render("Use hint? Y/N", True, (0, 0, 100))
+    text1 = _font18.render("Sorry! No logical", True, (0, 0, 0))
+    text2 = _font18.render("moves available.", True, (0, 0, 0))
+    text3 = _font16.render(f"Hints left: {hints}", True, (100, 0, 0))
+    text4 = _font16.render("Use hint? Y/N", True, (0, 0, 100))
 
-    screen.blit(text1, (popup_x + 20, popup_y + 15))
-    screen.blit(text2, (popup_x + 20, popup_y + 32))
-    screen.blit(text3, (popup_x + 45, popup_y + 52))
-    screen.blit(text4, (popup_x + 50, popup_y + 72))
+    popup.blit(text1, (20, 15))
+    popup.blit(text2, (20, 32))
+    popup.blit(text3, (45, 52))
+    popup.blit(text4, (50, 72))
+    return popup
 
 
 def draw_hint_counter(screen: pygame.Surface):
     """Draw hints remaining counter"""
     hints = field.get_hints_remaining()
     if hints > 0:
-        font = pygame.font.Font(None, 14)
-        text = font.render(f"Hints: {hints}", True, (255, 200, 0))
-        scr_w, _ = screen.get_size()
-        screen.blit(text, (scr_w // 2 - 20, 32))
+        screen.blit(get_hint_counter_surface(hints), (_scr_w // 2 - 20, 32))
+
+
+@functools.lru_cache(maxsize=8)
+def get_hint_counter_surface(hints: int) -> pygame.Surface:
+    return _font14.render(f"Hints: {hints}", True, (255, 200, 0)).convert_alpha()
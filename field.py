@@ -1,20 +1,26 @@
 import random
-import dataclasses
 import time
-from typing import Iterable
+from collections import deque
+
+import numpy as np
+
+import _field_core
 
 MAX_MINES_PCT = 0.5
 MIN_FIELD_SIZE = 5
 MAX_FIELD_SIZE = 64
 
-
-@dataclasses.dataclass
-class Cell:
-    content: int  # 0 - no mines around, 8 - 8 mines around, -1 - mine, -2 - exploded mine
-    state: int  # 0 - hidden, 1 - revealed, 2 - flagged, 3 - false flagged
+_NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
 
 
-_field: list[list[Cell]] = None
+# The field is stored as two (width, height) int8 arrays indexed by [x, y]
+_content: np.ndarray = None  # 0 - no mines around, 8 - 8 mines around, -1 - mine, -2 - exploded mine
+_state: np.ndarray = None  # 0 - hidden, 1 - revealed, 2 - flagged, 3 - false flagged
+# Flat signed-byte views sharing memory with the arrays above, indexed by x * _height + y.
+# Single cell reads and writes go through these since indexing a memoryview is much cheaper than a NumPy scalar
+_content_cells: memoryview = None
+_state_cells: memoryview = None
+_neighbors: list[list[tuple[tuple[int, int], ...]]] = None  # in-bounds neighbors of every cell, by [x][y]
 _width: int = 9
 _height: int = 9
 _mine_count: int = 0
@@ -27,6 +33,9 @@ _game_finish_time: int = None
 
 _preview_pos: tuple[int, int] = None
 
+# Cells whose look changed since the last pop_dirty() call
+_dirty: set[tuple[int, int]] = set()
+
 # Hint system variables
 _hints_remaining: int = 3
 _hint_cell: tuple[int, int] = None
@@ -55,7 +64,8 @@ def get_time() -> int:
 
 
 def get_cell_state(x: int, y: int) -> tuple[int, int]:
-    return _field[x][y].content, _field[x][y].state
+    i = x * _height + y
+    return _content_cells[i], _state_cells[i]
 
 
 def game_won() -> bool:
@@ -66,8 +76,16 @@ def game_over() -> bool:
     return _game_over
 
 
+def pop_dirty() -> set[tuple[int, int]]:
+    """Return the cells that changed since the previous call and start a new set"""
+    global _dirty
+    dirty = _dirty
+    _dirty = set()
+    return dirty
+
+
 def start_game(width: int, height: int, mine_count: int):
-    global _width, _height, _field, _mine_count, _flags_count, _revealed_count, _start_time, _victory, _game_over, _game_finish_time, _preview_pos, _hints_remaining, _hint_cell, _show_hint_popup, _hint_popup_timer
+    global _width, _height, _content, _state, _content_cells, _state_cells, _neighbors, _mine_count, _flags_count, _revealed_count, _start_time, _victory, _game_over, _game_finish_time, _preview_pos, _hints_remaining, _hint_cell, _show_hint_popup, _hint_popup_timer, _dirty
 
     if width < MIN_FIELD_SIZE or height < MIN_FIELD_SIZE:
         raise ValueError(f'Requested field size is too small.\nMinimum dimension is {MIN_FIELD_SIZE}')
@@ -76,24 +94,17 @@ def start_game(width: int, height: int, mine_count: int):
     if mine_count > width * height * MAX_MINES_PCT:
         raise ValueError(f'Requested mine count is too large.\n Mine count cannot exceed cell count times {MAX_MINES_PCT}')
 
+    if (width, height) != (_width, _height) or _neighbors is None:
+        _neighbors = [[_in_bounds_neighbors(x, y, width, height) for y in range(height)] for x in range(width)]
     _width = width
     _height = height
-    _field = [[Cell(content=0, state=0) for _ in range(height)] for _ in range(width)]
-
-    c = 0
-    while c < mine_count:
-        x, y = random.randint(0, width - 1), random.randint(0, height - 1)
-        if _field[x][y].content != 0:
-            continue
-        _field[x][y].content = -1
-        c += 1
-
-    for x in range(width):
-        for y in range(height):
-            if _field[x][y].content != 0:
-                continue
+    _state = np.zeros((width, height), np.int8)
 
-            _field[x][y].content = _count_neighbor_mines(x, y)
+    mines = np.zeros((width, height), bool)
+    mines.flat[np.random.choice(width * height, mine_count, replace=False)] = True
+    _content = _field_contents(mines)
+    _content_cells = _flat_view(_content)
+    _state_cells = _flat_view(_state)
 
     _mine_count = mine_count
     _flags_count = _revealed_count = 0
@@ -104,41 +115,39 @@ def start_game(width: int, height: int, mine_count: int):
     _hint_cell = None
     _show_hint_popup = False
     _hint_popup_timer = 0
+    _dirty = set()
+
+
+def _in_bounds_neighbors(x: int, y: int, width: int, height: int) -> tuple[tuple[int, int], ...]:
+    return tuple(
+        (x + dx, y + dy) for dx, dy in _NEIGHBOR_OFFSETS if 0 <= x + dx < width and 0 <= y + dy < height
+    )
 
 
-def iter_neighbors(x: int, y: int) -> Iterable[tuple[int, int]]:
-    if y > 0:
-        yield x, y - 1
-    if y < _height - 1:
-        yield x, y + 1
+def _neighbor_sum(mask: np.ndarray) -> np.ndarray:
+    """For every cell count how many of its 8 neighbors are set in mask"""
+    w, h = mask.shape
+    padded = np.pad(mask.astype(np.int8), 1)
+    total = np.zeros((w, h), np.int8)
+    for dx in range(3):
+        for dy in range(3):
+            if dx != 1 or dy != 1:
+                total += padded[dx:dx + w, dy:dy + h]
+    return total
 
-    if x > 0:
-        yield x - 1, y
-        if y > 0:
-            yield x - 1, y - 1
-        if y < _height - 1:
-            yield x - 1, y + 1
 
-    if x < _width - 1:
-        yield x + 1, y
-        if y > 0:
-            yield x + 1, y - 1
-        if y < _height - 1:
-            yield x + 1, y + 1
+def _flat_view(array: np.ndarray) -> memoryview:
+    return memoryview(array).cast('B').cast('b')
 
 
-def _count_neighbor_mines(x: int, y: int) -> int:
-    count = 0
-    for i, j in iter_neighbors(x, y):
-        count += _field[i][j].content == -1
-    return count
+def _field_contents(mines: np.ndarray) -> np.ndarray:
+    """Build the content array for a mine mask: -1 for mines, neighbor mine count elsewhere"""
+    return np.where(mines, -1, _neighbor_sum(mines)).astype(np.int8)
 
 
 def _count_neighbor_flags(x: int, y: int) -> int:
-    count = 0
-    for i, j in iter_neighbors(x, y):
-        count += _field[i][j].state == 2
-    return count
+    area = _state[max(x - 1, 0):x + 2, max(y - 1, 0):y + 2]
+    return int(np.count_nonzero(area == 2)) - int(_state_cells[x * _height + y] == 2)
 
 
 def flag_cell(x: int, y: int):
@@ -147,27 +156,30 @@ def flag_cell(x: int, y: int):
     if _game_over or _victory:
         return
 
-    if _field[x][y].state == 1:
+    i = x * _height + y
+    if _state_cells[i] == 1:
         return
 
-    if _field[x][y].state == 2:
-        _field[x][y].state = 0
+    if _state_cells[i] == 2:
+        _state_cells[i] = 0
         _flags_count -= 1
     else:
-        _field[x][y].state = 2
+        _state_cells[i] = 2
         _flags_count += 1
+    _dirty.add((x, y))
 
 
 def cell_up(x: int, y: int):
     if _game_over or _victory:
         return
 
-    if _field[x][y].state == 0:
+    i = x * _height + y
+    if _state_cells[i] == 0:
         reveal_cell(x, y)
-    elif _field[x][y].state == 1 and _field[x][y].content > 0:
-        if _count_neighbor_flags(x, y) != _field[x][y].content:
+    elif _state_cells[i] == 1 and _content_cells[i] > 0:
+        if _count_neighbor_flags(x, y) != _content_cells[i]:
             return
-        for i, j in iter_neighbors(x, y):
+        for i, j in _neighbors[x][y]:
             reveal_cell(i, j)
 
 
@@ -177,34 +189,26 @@ def reveal_cell(x: int, y: int):
     if _game_over or _victory:
         return
 
-    if _field[x][y].state == 2 or _field[x][y].state == 1:
+    i = x * _height + y
+    if _state_cells[i] == 2 or _state_cells[i] == 1:
         return
 
-    if _field[x][y].content == -1:
+    if _content_cells[i] == -1:
         if _start_time is not None:
-            _field[x][y].content = -2
+            _content_cells[i] = -2
             _game_finish_time = get_time()
             _game_over = True
             game_over_reveal()
             return
 
-        while True:
-            new_x, new_y = random.randint(0, _width - 1), random.randint(0, _height - 1)
-            if new_x == x and new_y == y:
-                continue
-            if _field[new_x][new_y].content < 0:
-                continue
-
-            _field[x][y].content = _count_neighbor_mines(x, y)
-            for i, j in iter_neighbors(x, y):
-                if _field[i][j].content >= 0:
-                    _field[i][j].content = _count_neighbor_mines(i, j)
+        # First click is never a mine: move it to a random cell without one
+        candidates = np.flatnonzero(_content >= 0)
+        new_x, new_y = divmod(int(random.choice(candidates)), _height)
 
-            _field[new_x][new_y].content = -1
-            for i, j in iter_neighbors(new_x, new_y):
-                if _field[i][j].content >= 0:
-                    _field[i][j].content = _count_neighbor_mines(i, j)
-            break
+        mines = _content < 0
+        mines[x, y] = False
+        mines[new_x, new_y] = True
+        _content[...] = _field_contents(mines)
 
     if _start_time is None:
         _start_time = time.monotonic()
@@ -221,85 +225,96 @@ def reveal_cell(x: int, y: int):
 def reveal_emply_cell(x: int, y: int):
     global _revealed_count
 
-    if _field[x][y].content > 0:
-        if _field[x][y].state == 0:
-            _field[x][y].state = 1
+    i = x * _height + y
+    if _content_cells[i] > 0:
+        if _state_cells[i] == 0:
+            _state_cells[i] = 1
             _revealed_count += 1
+            _dirty.add((x, y))
         return
 
-    visited: set[tuple[int, int]] = set()
-    to_visit: list[tuple[int, int]] = [(x, y)]
-    while len(to_visit) > 0:
-        x, y = to_visit.pop()
-        if x < 0 or y < 0 or x >= _width or y >= _height:
-            continue
-        if (x, y) in visited:
-            continue
-
-        if _field[x][y].state == 0:
-            _field[x][y].state = 1
-            _revealed_count += 1
-        visited.add((x, y))
-
-        if _field[x][y].content != 0:
-            continue
-        to_visit.extend(
-            (
-                (x - 1, y),
-                (x + 1, y),
-                (x - 1, y - 1),
-                (x + 1, y + 1),
-                (x - 1, y + 1),
-                (x + 1, y - 1),
-                (x, y - 1),
-                (x, y + 1),
-            )
-        )
+    if _field_core.njit is not None:
+        revealed = _field_core.flood_fill(_content, x, y)
+    else:
+        # Breadth-first flood fill over empty cells, every visited cell gets revealed
+        height = _height
+        visited = bytearray(_width * height)
+        visited[x * height + y] = 1
+        to_visit = deque([(x, y)])
+        while to_visit:
+            x, y = to_visit.popleft()
+            if _content_cells[x * height + y] != 0:
+                continue
+            for i, j in _neighbors[x][y]:
+                if not visited[i * height + j]:
+                    visited[i * height + j] = 1
+                    to_visit.append((i, j))
+        revealed = np.frombuffer(visited, bool).reshape(_width, height)
+
+    revealed = revealed & (_state == 0)
+    _state[revealed] = 1
+    _revealed_count += int(np.count_nonzero(revealed))
+    _mark_dirty(revealed)
 
 
 def game_over_reveal():
-    for row in _field:
-        for cell in row:
-            if -2 <= cell.content <= -1 and cell.state == 0:
-                cell.state = 1
-            if 0 <= cell.content <= 8 and cell.state == 2:
-                cell.state = 3
+    mines = (_content < 0) & (_state == 0)
+    false_flags = (_content >= 0) & (_state == 2)
+    _state[mines] = 1
+    _state[false_flags] = 3
+    _mark_dirty(mines | false_flags)
 
 
 def victory_flag():
     global _flags_count
-    for row in _field:
-        for cell in row:
-            if cell.content == -1:
-                cell.state = 2
+    unflagged = (_content == -1) & (_state != 2)
+    _state[unflagged] = 2
+    _mark_dirty(unflagged)
     _flags_count = _mine_count
 
 
+def _mark_dirty(mask: np.ndarray):
+    _dirty.update(map(tuple, np.argwhere(mask).tolist()))
+
+
 def set_preview(x: int, y: int):
     global _preview_pos
     if _game_over or _victory:
         return
 
-    if 0 <= _field[x][y].state <= 1:
+    old_pos = _preview_pos
+    old_cells = get_preview_set()
+    if 0 <= _state_cells[x * _height + y] <= 1:
         _preview_pos = x, y
     else:
         _preview_pos = None
 
+    if _preview_pos != old_pos:
+        _dirty.update(old_cells)
+        _dirty.update(get_preview_set())
+
 
 def clear_preview():
     global _preview_pos
+    _dirty.update(get_preview_set())
     _preview_pos = None
 
 
-def in_preview(x: int, y: int):
+def get_preview_set() -> set[tuple[int, int]]:
+    """Return all cells currently drawn as pressed by the preview"""
     if _preview_pos is None:
-        return False
+        return set()
 
-    if _field[_preview_pos[0]][_preview_pos[1]].state == 0:  # hidden
-        return (x, y) == _preview_pos
-    elif _field[_preview_pos[0]][_preview_pos[1]].state == 1 and _field[_preview_pos[0]][_preview_pos[1]].content > 0:  # number
-        return abs(x - _preview_pos[0]) < 2 and abs(y - _preview_pos[1]) < 2 and _field[x][y].state == 0
-    return False
+    px, py = _preview_pos
+    if _state_cells[px * _height + py] == 0:  # hidden
+        return {_preview_pos}
+    elif _state_cells[px * _height + py] == 1 and _content_cells[px * _height + py] > 0:  # number
+        return {(i, j) for i, j in _neighbors[px][py] if _state_cells[i * _height + j] == 0}
+    return set()
+
+
+def in_preview(x: int, y: int):
+    return (x, y) in get_preview_set()
 
 
 def is_preview():
@@ -318,8 +333,16 @@ def get_hint_cell() -> tuple[int, int]:
 
 
 def clear_hint():
+    _set_hint_cell(None)
+
+
+def _set_hint_cell(cell: tuple[int, int]):
     global _hint_cell
-    _hint_cell = None
+    if _hint_cell is not None:
+        _dirty.add(_hint_cell)
+    if cell is not None:
+        _dirty.add(cell)
+    _hint_cell = cell
 
 
 def show_hint_popup() -> bool:
@@ -339,88 +362,51 @@ def update_hint_popup():
         pass  # Keep showing until user responds
 
 
+def _logical_masks() -> tuple[np.ndarray, np.ndarray]:
+    """Find revealed numbers whose hidden neighbors are all safe or all mines"""
+    flagged_count = _neighbor_sum(_state == 2)
+    hidden_count = _neighbor_sum(_state == 0)
+    numbers = (_state == 1) & (_content > 0) & (hidden_count > 0)
+
+    # If all mines are flagged, the remaining hidden neighbors are safe
+    safe = numbers & (flagged_count == _content)
+    # If remaining hidden cells equals remaining mines, all are mines
+    mines = numbers & (_content - flagged_count == hidden_count)
+    return safe, mines
+
+
 def has_logical_moves() -> bool:
     """Check if there are any safe logical moves available"""
     if _game_over or _victory or _start_time is None:
         return True  # Game not started or finished
 
-    # Check for cells that can be logically determined
-    for x in range(_width):
-        for y in range(_height):
-            cell = _field[x][y]
-
-            # Skip if not revealed or is a mine
-            if cell.state != 1 or cell.content <= 0:
-                continue
-
-            # Count neighbors
-            hidden_neighbors = []
-            flagged_count = 0
-
-            for nx, ny in iter_neighbors(x, y):
-                neighbor = _field[nx][ny]
-                if neighbor.state == 2:  # Flagged
-                    flagged_count += 1
-                elif neighbor.state == 0:  # Hidden
-                    hidden_neighbors.append((nx, ny))
-
-            # If all mines are flagged and there are hidden cells, those are safe
-            if flagged_count == cell.content and len(hidden_neighbors) > 0:
-                return True
-
-            # If remaining hidden cells equals remaining mines, all are mines
-            remaining_mines = cell.content - flagged_count
-            if remaining_mines == len(hidden_neighbors) and remaining_mines > 0:
-                return True
-
-    return False
+    safe, mines = _logical_masks()
+    return bool(safe.any() or mines.any())
 
 
 def find_safe_hint() -> tuple[int, int]:
     """Find a safe cell to reveal as a hint"""
-    # First, look for cells that are logically safe
-    for x in range(_width):
-        for y in range(_height):
-            cell = _field[x][y]
+    safe_cells = (_state == 0) & (_content >= 0)
 
-            # Skip if not revealed or is a mine
-            if cell.state != 1 or cell.content <= 0:
-                continue
-
-            # Count neighbors
-            hidden_neighbors = []
-            flagged_count = 0
-
-            for nx, ny in iter_neighbors(x, y):
-                neighbor = _field[nx][ny]
-                if neighbor.state == 2:  # Flagged
-                    flagged_count += 1
-                elif neighbor.state == 0:  # Hidden
-                    hidden_neighbors.append((nx, ny))
-
-            # If all mines are flagged, hidden neighbors are safe
-            if flagged_count == cell.content and len(hidden_neighbors) > 0:
-                # Return a safe cell that isn't a mine
-                for hx, hy in hidden_neighbors:
-                    if _field[hx][hy].content >= 0:  # Not a mine
-                        return (hx, hy)
+    # First, look for hidden neighbors of numbers that already have all their mines flagged
+    safe, _ = _logical_masks()
+    logical_cells = np.argwhere(safe_cells & (_neighbor_sum(safe) > 0))
+    if len(logical_cells) > 0:
+        x, y = logical_cells[0].tolist()
+        return x, y
 
     # If no logical move, find any safe unrevealed cell
-    safe_cells = []
-    for x in range(_width):
-        for y in range(_height):
-            if _field[x][y].state == 0 and _field[x][y].content >= 0:
-                safe_cells.append((x, y))
-
-    if safe_cells:
-        return random.choice(safe_cells)
+    safe_cells = np.argwhere(safe_cells)
+    if len(safe_cells) > 0:
+        x, y = random.choice(safe_cells.tolist())
+        return x, y
 
     return None
 
 
 def use_hint():
     """Use a hint - directly highlight a safe cell"""
-    global _hints_remaining, _hint_cell
+    global _hints_remaining
 
     if _game_over or _victory or _start_time is None:
         return False
@@ -431,7 +417,7 @@ def use_hint():
     # Find and highlight a safe cell
     safe_cell = find_safe_hint()
     if safe_cell:
-        _hint_cell = safe_cell
+        _set_hint_cell(safe_cell)
         _hints_remaining -= 1
         return True
 
@@ -440,14 +426,14 @@ def use_hint():
 
 def accept_hint():
     """Accept the hint and highlight a safe cell"""
-    global _hints_remaining, _hint_cell
+    global _hints_remaining
 
     if _hints_remaining <= 0:
         return False
 
     safe_cell = find_safe_hint()
     if safe_cell:
-        _hint_cell = safe_cell
+        _set_hint_cell(safe_cell)
         _hints_remaining -= 1
         set_hint_popup(False)
         return True
@@ -12,12 +12,20 @@ field_height = 16
 mine_count = 40
 
 FPS = 60
+MAX_UPDATE_RECTS = 20  # above this many dirty rects a single bounding rect is presented instead
 mouse_left_down: bool = False
 
+# The screen is only redrawn after input, a field change or a timer tick
+_needs_redraw: bool = True
+_last_shown_time: int = None
+
 
 def start_new_game():
+    global _needs_redraw
     field.start_game(field_width, field_height, mine_count)
     draw.set_screen(field_width, field_height)
+    draw.invalidate()
+    _needs_redraw = True
 
 
 def get_mouse_pos():
@@ -28,11 +36,14 @@ def get_mouse_pos():
 
 
 def process_input():
-    global mouse_left_down
+    global mouse_left_down, _needs_redraw
 
     for event in pygame.event.get():
+        _needs_redraw = True
         if event.type == pygame.QUIT:
             return True
+        if event.type == pygame.VIDEOEXPOSE:
+            draw.invalidate()
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 return True
@@ -83,9 +94,9 @@ def process_input():
 
 
 def main():
+    global _needs_redraw, _last_shown_time
     pygame.init()
     pygame.display.set_caption("Minesweeper in Python!")
-    draw.load_assets()
     clock = pygame.time.Clock()
 
     start_new_game()
@@ -94,8 +105,15 @@ def main():
         if process_input():
             break
 
-        draw.draw_screen()
-        pygame.display.flip()
+        dirty_cells = field.pop_dirty()
+        shown_time = field.get_time()
+        if _needs_redraw or dirty_cells or shown_time != _last_shown_time:
+            dirty_rects = draw.draw_screen(dirty_cells)
+            if len(dirty_rects) > MAX_UPDATE_RECTS:
+                dirty_rects = [dirty_rects[0].unionall(dirty_rects[1:])]
+            pygame.display.update(dirty_rects)
+            _needs_redraw = False
+            _last_shown_time = shown_time
         clock.tick(FPS)
     pygame.quit()
 
@@ -1,13 +1,22 @@
 import pygame
-import random
+import numpy as np
 import time
 import json
 import os
 from datetime import datetime
 from enum import Enum
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, without it the board kernels run as plain Python
+    njit = None
+
 # Initialize Pygame
 pygame.init()
+# Keep SDL from queueing event types the game never looks at
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN,
+                          pygame.VIDEOEXPOSE])
 
 # Colors - Modern Dark Theme
 BG_COLOR = (40, 44, 52)
@@ -35,6 +44,18 @@ NUMBER_COLORS = {
     8: (44, 62, 80)     # Darker gray
 }
 
+# Every cell is one byte: the adjacent mine count in the low 4 bits plus state flags
+ADJACENT_MASK = 0x0F
+MINE_BIT = 0x10
+REVEALED_BIT = 0x20
+FLAGGED_BIT = 0x40
+# Extra bits on top of a cell byte for how it is drawn
+HOVER_LOOK = 0x100
+HINT_LOOK = 0x200
+
+# Above this many changed areas a frame updates their bounding box instead
+MAX_UPDATE_RECTS = 20
+
 class Difficulty(Enum):
     EASY = ("Easy", 9, 9, 10)
     MEDIUM = ("Medium", 16, 16, 40)
@@ -46,14 +67,57 @@ class Difficulty(Enum):
         self.cols = cols
         self.mines = mines
 
-class Cell:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.adjacent_mines = 0
+def _neighbor_sum(mask):
+    """For every cell count how many of its 8 neighbors are set in mask"""
+    rows, cols = mask.shape
+    padded = np.pad(mask.astype(np.int8), 1)
+    total = np.zeros((rows, cols), np.int8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                total += padded[dr:dr + rows, dc:dc + cols]
+    return total
+
+def _neighbor_table(rows, cols):
+    """Flat indices of every cell's in-bounds neighbors in CSR form: the neighbors of
+    cell i are neighbors[offsets[i]:offsets[i + 1]]"""
+    offsets = np.zeros(rows * cols + 1, np.int32)
+    neighbors = []
+    for row in range(rows):
+        for col in range(cols):
+            for r in range(max(row - 1, 0), min(row + 2, rows)):
+                for c in range(max(col - 1, 0), min(col + 2, cols)):
+                    if r != row or c != col:
+                        neighbors.append(r * cols + c)
+            offsets[row * cols + col + 1] = len(neighbors)
+    return offsets, np.array(neighbors, np.int32)
+
+def _flood_reveal(cells, start, neighbor_offsets, neighbors):
+    """Flood fill from an empty cell, opening every unflagged neighbor and
+    continuing through the ones that are empty too. Returns how many cells it opened"""
+    # Every cell is pushed at most once, when it gets revealed
+    stack = np.empty(cells.size, np.int32)
+    stack[0] = start
+    size = 1
+    revealed = 0
+    while size > 0:
+        size -= 1
+        cell = stack[size]
+        for k in range(neighbor_offsets[cell], neighbor_offsets[cell + 1]):
+            i = neighbors[k]
+            if cells[i] & (REVEALED_BIT | FLAGGED_BIT):
+                continue
+            cells[i] |= REVEALED_BIT
+            revealed += 1
+            if cells[i] & ADJACENT_MASK == 0:
+                stack[size] = i
+                size += 1
+    return revealed
+
+if njit is not None:
+    _flood_reveal = njit(cache=True)(_flood_reveal)
+    # Compile now rather than on the first click of the first game
+    _flood_reveal(np.zeros(1, np.uint8), 0, *_neighbor_table(1, 1))
 
 class Button:
     def __init__(self, x, y, width, height, text, callback=None, font_size=20):
@@ -109,12 +173,55 @@ class MinesweeperGame:
         self.width = game_width + self.right_panel_width + self.padding * 3
         self.height = game_height + self.top_panel_height + self.padding * 2
 
-        self.screen = pygame.display.set_mode((self.width, self.height))
+        try:
+            # GPU backed, vsynced window
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+        except pygame.error:
+            # No renderer available for a scaled window, use a plain one
+            self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption('Minesweeper Enhanced')
 
+        self.neighbor_offsets, self.neighbors = _neighbor_table(self.difficulty.rows, self.difficulty.cols)
+
         self.font_large = pygame.font.Font(None, 36)
         self.font_medium = pygame.font.Font(None, 24)
         self.font_small = pygame.font.Font(None, 18)
+        self.leaderboard_cache = None  # rendered leaderboard panel, rebuilt when scores or the mode change
+
+        # Cell sprites rendered once instead of every frame
+        self.number_surfaces = {n: self.font_medium.render(str(n), True, color)
+                                for n, color in NUMBER_COLORS.items()}
+        self.flag_surface = self.create_flag_surface()
+        # End of game banners, the default font has no emoji glyphs so they are plain text
+        self.won_banner = self.font_medium.render("   WON! Score: ", True, TEXT_COLOR)
+        self.lost_banner = self.font_medium.render("   GAME OVER", True, TEXT_COLOR)
+        self.info_key = None  # state the info line was last rendered for
+        self.info_surfaces = []
+        self.cell_hidden_surf = self.create_cell_surface(CELL_HIDDEN)
+        self.cell_revealed_surf = self.create_cell_surface(CELL_REVEALED)
+        self.cell_hover_surf = self.create_cell_surface(CELL_HOVER)
+        self.cell_hint_surf = self.create_cell_surface(HINT_COLOR, 3)
+
+    def create_cell_surface(self, color, width=0):
+        size = self.cell_size - 2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, surface.get_rect(), width, border_radius=3)
+        return surface
+
+    def create_flag_surface(self):
+        size = self.cell_size - 2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center_x, center_y = size // 2, size // 2
+        flag_points = [
+            (center_x - 5, center_y + 6),
+            (center_x - 5, center_y - 6),
+            (center_x + 6, center_y)
+        ]
+        pygame.draw.polygon(surface, FLAG_COLOR, flag_points)
+        pygame.draw.line(surface, TEXT_COLOR,
+                         (center_x - 5, center_y - 6),
+                         (center_x - 5, center_y + 6), 2)
+        return surface
 
     def create_ui_elements(self):
         # Mode buttons
@@ -136,6 +243,8 @@ class MinesweeperGame:
         self.new_game_btn = Button(hint_x + 90, button_y, 80, 35, "New (F2)", self.reset_game)
 
         self.buttons = [self.easy_btn, self.medium_btn, self.hard_btn, self.hint_btn, self.new_game_btn]
+        # Bounding box of all buttons, lets mouse motion elsewhere skip the per-button checks
+        self.toolbar_rect = self.buttons[0].rect.unionall([button.rect for button in self.buttons[1:]])
 
     def change_difficulty(self, difficulty):
         self.difficulty = difficulty
@@ -144,8 +253,9 @@ class MinesweeperGame:
         self.create_ui_elements()
 
     def reset_game(self):
-        self.board = [[Cell(row, col) for col in range(self.difficulty.cols)]
-                      for row in range(self.difficulty.rows)]
+        # Board state as one flat byte per cell, cell (row, col) is at row * cols + col
+        self.cells = np.zeros(self.difficulty.rows * self.difficulty.cols, np.uint8)
+        self.revealed_count = 0
         self.game_over = False
         self.game_won = False
         self.first_click = True
@@ -156,96 +266,79 @@ class MinesweeperGame:
         self.hint_cell = None
         self.hovered_cell = None
         self.score = 0
+        self.dirty = True  # the window needs to be redrawn
+        self.full_redraw = True  # the next draw repaints everything, not just changed cells
+        self.drawn_looks = None
 
     def place_mines(self, exclude_row, exclude_col):
-        mines_placed = 0
-        exclude_cells = set()
-
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                r, c = exclude_row + dr, exclude_col + dc
-                if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                    exclude_cells.add((r, c))
+        rows, cols = self.difficulty.rows, self.difficulty.cols
 
-        while mines_placed < self.difficulty.mines:
-            row = random.randint(0, self.difficulty.rows - 1)
-            col = random.randint(0, self.difficulty.cols - 1)
-
-            if not self.board[row][col].is_mine and (row, col) not in exclude_cells:
-                self.board[row][col].is_mine = True
-                mines_placed += 1
+        # Mines go anywhere except the first clicked cell and its neighbors
+        valid = np.ones((rows, cols), bool)
+        valid[max(exclude_row - 1, 0):exclude_row + 2, max(exclude_col - 1, 0):exclude_col + 2] = False
+        positions = np.random.choice(np.flatnonzero(valid), self.difficulty.mines, replace=False)
+        is_mine = np.zeros(rows * cols, bool)
+        is_mine[positions] = True
 
         # Calculate adjacent mines
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if not self.board[row][col].is_mine:
-                    count = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            r, c = row + dr, col + dc
-                            if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                                if self.board[r][c].is_mine:
-                                    count += 1
-                    self.board[row][col].adjacent_mines = count
+        counts = _neighbor_sum(is_mine.reshape(rows, cols)).reshape(-1)
+        self.cells |= np.where(is_mine, MINE_BIT, counts).astype(np.uint8)
 
     def reveal_cell(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed or cell.is_flagged:
+        i = row * self.difficulty.cols + col
+        cell = self.cells[i]
+        if cell & (REVEALED_BIT | FLAGGED_BIT):
             return
 
-        cell.is_revealed = True
+        self.cells[i] = cell | REVEALED_BIT
+        self.dirty = True
 
         if self.first_click:
             self.first_click = False
             self.start_time = time.time()
             self.place_mines(row, col)
-            cell = self.board[row][col]
+            cell = self.cells[i]
 
-        if cell.is_mine:
+        if cell & MINE_BIT:
             self.game_over = True
             self.reveal_all_mines()
             return
 
-        if cell.adjacent_mines == 0:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    self.reveal_cell(row + dr, col + dc)
+        self.revealed_count += 1
+        # Numbered cells, the common case, open just themselves
+        if cell & ADJACENT_MASK == 0:
+            self.revealed_count += self.reveal_empty_region(row, col)
 
         self.check_win()
 
+    def reveal_empty_region(self, row, col):
+        return _flood_reveal(self.cells, row * self.difficulty.cols + col, self.neighbor_offsets, self.neighbors)
+
     def reveal_all_mines(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if self.board[row][col].is_mine:
-                    self.board[row][col].is_revealed = True
+        self.cells[(self.cells & MINE_BIT) != 0] |= REVEALED_BIT
 
     def toggle_flag(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed:
+        i = row * self.difficulty.cols + col
+        if self.cells[i] & REVEALED_BIT:
             return
 
-        cell.is_flagged = not cell.is_flagged
-        if cell.is_flagged:
+        self.cells[i] ^= FLAGGED_BIT
+        self.dirty = True
+        if self.cells[i] & FLAGGED_BIT:
             self.flags_placed += 1
         else:
             self.flags_placed -= 1
 
     def check_win(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return
+        # Won once every cell without a mine is open
+        if self.revealed_count < self.cells.size - self.difficulty.mines:
+            return
 
         self.game_won = True
         self.game_over = True
@@ -277,16 +370,12 @@ class MinesweeperGame:
             return
 
         # Find a safe cell
-        safe_cells = []
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_revealed and not cell.is_mine and not cell.is_flagged:
-                    safe_cells.append((row, col))
-
-        if safe_cells:
-            self.hint_cell = random.choice(safe_cells)
+        safe_cells = np.flatnonzero((self.cells & (MINE_BIT | REVEALED_BIT | FLAGGED_BIT)) == 0)
+
+        if len(safe_cells) > 0:
+            self.hint_cell = divmod(int(np.random.choice(safe_cells)), self.difficulty.cols)
             self.hints_remaining -= 1
+            self.dirty = True
 
     def get_cell_from_pos(self, pos):
         x, y = pos
@@ -328,108 +417,165 @@ class MinesweeperGame:
         }
 
         diff_name = self.difficulty.display_name
-        self.leaderboard[diff_name].append(entry)
-        self.leaderboard[diff_name].sort(key=lambda x: x['score'], reverse=True)
-        self.leaderboard[diff_name] = self.leaderboard[diff_name][:10]  # Keep top 10
-
-        with open(self.leaderboard_file, 'w') as f:
-            json.dump(self.leaderboard, f, indent=2)
+        entries = sorted(self.leaderboard[diff_name] + [entry], key=lambda x: x['score'], reverse=True)
+        entries = entries[:10]  # Keep top 10
+        if entries == self.leaderboard[diff_name]:
+            return  # didn't make the top 10, nothing to save
+
+        self.leaderboard[diff_name] = entries
+        self.leaderboard_cache = None
+
+        # Write a compact copy next to the file and swap it in, so a crash can't leave it half written
+        tmp_file = self.leaderboard_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(self.leaderboard, f, separators=(',', ':'))
+        os.replace(tmp_file, self.leaderboard_file)
+
+    def get_cell_looks(self):
+        """Everything that decides how a cell is drawn, as one number per cell"""
+        looks = self.cells.astype(np.uint16)
+        cols = self.difficulty.cols
+        if self.hovered_cell and not self.game_over:
+            row, col = self.hovered_cell
+            looks[row * cols + col] |= HOVER_LOOK
+        if self.hint_cell:
+            row, col = self.hint_cell
+            looks[row * cols + col] |= HINT_LOOK
+        return looks
 
     def draw(self):
-        self.screen.fill(BG_COLOR)
+        looks = self.get_cell_looks()
+        full_redraw = self.full_redraw or self.leaderboard_cache is None
 
-        # Draw title
-        title = self.font_large.render("MINESWEEPER", True, TEXT_COLOR)
-        self.screen.blit(title, (self.padding, self.padding))
+        if full_redraw:
+            self.screen.fill(BG_COLOR)
 
-        # Draw mode buttons
-        for button in self.buttons:
-            button.draw(self.screen)
+            # Draw title
+            title = self.font_large.render("MINESWEEPER", True, TEXT_COLOR)
+            self.screen.blit(title, (self.padding, self.padding))
 
-        # Draw game info
-        info_y = self.padding + 95
+            # Draw mode buttons
+            for button in self.buttons:
+                button.draw(self.screen)
+
+            changed = range(looks.size)
+        else:
+            # Only repaint the cells that look different from the last frame
+            changed = np.flatnonzero(looks != self.drawn_looks).tolist()
+
+        dirty_rects = []
+        info_rect = self.draw_info(full_redraw)
+        if info_rect:
+            dirty_rects.append(info_rect)
+
+        # Draw game board, with everything the cell loop touches bound to locals
+        cols = self.difficulty.cols
+        cell_size = self.cell_size
+        board_x, board_y = self.padding, self.top_panel_height
+        screen = self.screen
+        blit, fill = screen.blit, screen.fill
+        draw_circle = pygame.draw.circle
+        revealed_surf, hover_surf, hidden_surf = self.cell_revealed_surf, self.cell_hover_surf, self.cell_hidden_surf
+        hint_surf, flag_surf = self.cell_hint_surf, self.flag_surface
+        number_surfaces = self.number_surfaces
+        add_dirty = dirty_rects.append
+        looks_list = looks.tolist()
+
+        for i in changed:
+            look = looks_list[i]
+            row, col = divmod(i, cols)
+            rect = pygame.Rect(board_x + col * cell_size, board_y + row * cell_size, cell_size - 2, cell_size - 2)
+            fill(BG_COLOR, rect)
+
+            if look & REVEALED_BIT:
+                blit(revealed_surf, rect)
+
+                if look & MINE_BIT:
+                    draw_circle(screen, MINE_COLOR, rect.center, cell_size // 4)
+                elif look & ADJACENT_MASK:
+                    text = number_surfaces[look & ADJACENT_MASK]
+                    blit(text, text.get_rect(center=rect.center))
+            else:
+                blit(hover_surf if look & HOVER_LOOK else hidden_surf, rect)
+
+                if look & HINT_LOOK:
+                    blit(hint_surf, rect)
+
+                if look & FLAGGED_BIT:
+                    blit(flag_surf, rect)
+            add_dirty(rect)
+
+        self.drawn_looks = looks
+        self.full_redraw = False
+
+        if full_redraw:
+            # Draw leaderboard panel
+            self.draw_leaderboard()
+            pygame.display.flip()
+        else:
+            if len(dirty_rects) > MAX_UPDATE_RECTS:
+                dirty_rects = [dirty_rects[0].unionall(dirty_rects[1:])]
+            pygame.display.update(dirty_rects)
+
+    def draw_info(self, force=False):
+        """Draw the counters line, returns the area it covers or None when it didn't change"""
         mines_left = self.difficulty.mines - self.flags_placed
-        info_text = f"Mines: {mines_left}   Time: {self.elapsed_time}s   Hints: {self.hints_remaining}"
-
-        if self.game_won:
-            info_text += f"   🎉 WON! Score: {self.score}"
-        elif self.game_over:
-            info_text += "   💥 GAME OVER"
-
-        info_surface = self.font_medium.render(info_text, True, TEXT_COLOR)
-        self.screen.blit(info_surface, (self.padding, info_y))
-
-        # Draw game board
-        board_x = self.padding
-        board_y = self.top_panel_height
-
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                x = board_x + col * self.cell_size
-                y = board_y + row * self.cell_size
-                rect = pygame.Rect(x, y, self.cell_size - 2, self.cell_size - 2)
-
-                # Check if this is the hint cell or hovered cell
-                is_hint = self.hint_cell and self.hint_cell == (row, col)
-                is_hovered = self.hovered_cell == (row, col)
-
-                if cell.is_revealed:
-                    pygame.draw.rect(self.screen, CELL_REVEALED, rect, border_radius=3)
-
-                    if cell.is_mine:
-                        pygame.draw.circle(self.screen, MINE_COLOR,
-                                         rect.center, self.cell_size // 4)
-                    elif cell.adjacent_mines > 0:
-                        color = NUMBER_COLORS[cell.adjacent_mines]
-                        text = self.font_medium.render(str(cell.adjacent_mines), True, color)
-                        text_rect = text.get_rect(center=rect.center)
-                        self.screen.blit(text, text_rect)
-                else:
-                    color = CELL_HOVER if is_hovered and not self.game_over else CELL_HIDDEN
-                    pygame.draw.rect(self.screen, color, rect, border_radius=3)
-
-                    if is_hint:
-                        pygame.draw.rect(self.screen, HINT_COLOR, rect, 3, border_radius=3)
-
-                    if cell.is_flagged:
-                        flag_points = [
-                            (rect.centerx - 5, rect.centery + 6),
-                            (rect.centerx - 5, rect.centery - 6),
-                            (rect.centerx + 6, rect.centery)
-                        ]
-                        pygame.draw.polygon(self.screen, FLAG_COLOR, flag_points)
-                        pygame.draw.line(self.screen, TEXT_COLOR,
-                                       (rect.centerx - 5, rect.centery - 6),
-                                       (rect.centerx - 5, rect.centery + 6), 2)
-
-        # Draw leaderboard panel
-        self.draw_leaderboard()
-
-        pygame.display.flip()
+        info_key = (mines_left, self.elapsed_time, self.hints_remaining, self.game_won, self.game_over)
+        if info_key != self.info_key:
+            self.info_key = info_key
+            info_text = f"Mines: {mines_left}   Time: {self.elapsed_time}s   Hints: {self.hints_remaining}"
+            self.info_surfaces = [self.font_medium.render(info_text, True, TEXT_COLOR)]
+            if self.game_won:
+                self.info_surfaces.append(self.won_banner)
+                self.info_surfaces.append(self.font_medium.render(str(self.score), True, TEXT_COLOR))
+            elif self.game_over:
+                self.info_surfaces.append(self.lost_banner)
+        elif not force:
+            return None
+
+        info_y = self.padding + 95
+        info_rect = pygame.Rect(0, info_y, self.width, self.top_panel_height - info_y)
+        self.screen.fill(BG_COLOR, info_rect)
+
+        # Draw game info
+        x = self.padding
+        for surface in self.info_surfaces:
+            self.screen.blit(surface, (x, info_y))
+            x += surface.get_width()
+        return info_rect
 
     def draw_leaderboard(self):
         panel_x = self.padding * 2 + self.difficulty.cols * self.cell_size
         panel_y = self.top_panel_height
+
+        if self.leaderboard_cache is None:
+            self.leaderboard_cache = self.render_leaderboard()
+        self.screen.blit(self.leaderboard_cache, (panel_x, panel_y))
+
+    def render_leaderboard(self):
+        # The entries can run past the bottom of the panel on small boards,
+        # so the surface reaches down to the bottom of the window
         panel_width = self.right_panel_width
         panel_height = self.difficulty.rows * self.cell_size
+        surface = pygame.Surface((panel_width, self.height - self.top_panel_height))
+        surface.fill(BG_COLOR)
 
         # Panel background
-        pygame.draw.rect(self.screen, PANEL_BG, (panel_x, panel_y, panel_width, panel_height), border_radius=5)
+        pygame.draw.rect(surface, PANEL_BG, (0, 0, panel_width, panel_height), border_radius=5)
 
         # Title
         title = self.font_medium.render("LEADERBOARD", True, TEXT_COLOR)
-        title_rect = title.get_rect(centerx=panel_x + panel_width // 2)
-        self.screen.blit(title, (title_rect.x, panel_y + 10))
+        title_rect = title.get_rect(centerx=panel_width // 2)
+        surface.blit(title, (title_rect.x, 10))
 
         # Difficulty tabs
         diff_name = self.font_small.render(f"{self.difficulty.display_name} Mode", True, BUTTON_COLOR)
-        diff_rect = diff_name.get_rect(centerx=panel_x + panel_width // 2)
-        self.screen.blit(diff_name, (diff_rect.x, panel_y + 40))
+        diff_rect = diff_name.get_rect(centerx=panel_width // 2)
+        surface.blit(diff_name, (diff_rect.x, 40))
 
         # Leaderboard entries
         entries = self.leaderboard.get(self.difficulty.display_name, [])
-        entry_y = panel_y + 70
+        entry_y = 70
 
         for i, entry in enumerate(entries[:10]):
             rank_text = f"{i+1}."
@@ -440,40 +586,68 @@ class MinesweeperGame:
             score = self.font_small.render(score_text, True, BUTTON_COLOR)
             time = self.font_small.render(time_text, True, TEXT_COLOR)
 
-            self.screen.blit(rank, (panel_x + 10, entry_y))
-            self.screen.blit(score, (panel_x + 40, entry_y))
-            self.screen.blit(time, (panel_x + 150, entry_y))
+            surface.blit(rank, (10, entry_y))
+            surface.blit(score, (40, entry_y))
+            surface.blit(time, (150, entry_y))
 
             entry_y += 25
 
         if not entries:
             no_scores = self.font_small.render("No scores yet!", True, TEXT_COLOR)
-            no_scores_rect = no_scores.get_rect(centerx=panel_x + panel_width // 2)
-            self.screen.blit(no_scores, (no_scores_rect.x, panel_y + 100))
+            no_scores_rect = no_scores.get_rect(centerx=panel_width // 2)
+            surface.blit(no_scores, (no_scores_rect.x, 100))
+
+        return surface
+
+    def handle_button_event(self, event):
+        for button in self.buttons:
+            was_hovered = button.hovered
+            button.handle_event(event)
+            if button.hovered != was_hovered:
+                self.dirty = self.full_redraw = True
+
+    def handle_mouse_motion(self, event):
+        if self.toolbar_rect.collidepoint(event.pos):
+            self.handle_button_event(event)
+        else:
+            for button in self.buttons:
+                if button.hovered:
+                    button.hovered = False
+                    self.dirty = self.full_redraw = True
+
+        row, col = self.get_cell_from_pos(event.pos)
+        hovered_cell = (row, col) if row is not None else None
+        if hovered_cell != self.hovered_cell:
+            self.hovered_cell = hovered_cell
+            self.dirty = True
 
     def run(self):
         clock = pygame.time.Clock()
         running = True
 
         while running:
+            last_motion = None
             for event in pygame.event.get():
+                # Only the latest mouse position matters for hovering, it is handled once after the queue
+                if event.type == pygame.MOUSEMOTION:
+                    last_motion = event
+                    continue
+
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.dirty = self.full_redraw = True
 
                 # Handle button events
-                for button in self.buttons:
-                    button.handle_event(event)
-
-                if event.type == pygame.MOUSEMOTION:
-                    row, col = self.get_cell_from_pos(event.pos)
-                    self.hovered_cell = (row, col) if row is not None else None
+                self.handle_button_event(event)
 
-                elif event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+                if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
                     row, col = self.get_cell_from_pos(event.pos)
                     if row is not None and col is not None:
                         if event.button == 1:  # Left click
                             if self.hint_cell and self.hint_cell == (row, col):
                                 self.hint_cell = None
+                                self.dirty = True
                             self.reveal_cell(row, col)
                         elif event.button == 3:  # Right click
                             self.toggle_flag(row, col)
@@ -486,11 +660,20 @@ class MinesweeperGame:
                     elif event.key == pygame.K_ESCAPE:
                         running = False
 
+            if last_motion is not None:
+                self.handle_mouse_motion(last_motion)
+
             # Update timer
             if self.start_time and not self.game_over:
-                self.elapsed_time = int(time.time() - self.start_time)
-
-            self.draw()
+                elapsed_time = int(time.time() - self.start_time)
+                if elapsed_time != self.elapsed_time:
+                    self.elapsed_time = elapsed_time
+                    self.dirty = True
+
+            # Only redraw when something visible changed, keep ticking for input latency
+            if self.dirty:
+                self.draw()
+                self.dirty = False
             clock.tick(60)
 
         pygame.quit()
@@ -1,11 +1,18 @@
 import pygame
+import numpy as np
 import random
 import time
+import bisect
 import json
 import os
 from datetime import datetime
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, the leaderboard then goes through the json module
+    orjson = None
+
 # Initialize Pygame
 pygame.init()
 
@@ -24,6 +31,12 @@ FLAG_COLOR = (46, 204, 113)
 HINT_COLOR = (241, 196, 15)
 CHEAT_COLOR = (255, 0, 255)  # Magenta for cheat mode
 
+# Offsets of the 8 cells around a cell
+NEIGHBORS8 = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+# Above this many dirty rects a single bounding rect is cheaper to push to the display
+MAX_UPDATE_RECTS = 20
+
 # Number colors
 NUMBER_COLORS = {
     1: (52, 152, 219),  # Blue
@@ -47,23 +60,22 @@ class Difficulty(Enum):
         self.cols = cols
         self.mines = mines
 
-class Cell:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.adjacent_mines = 0
-
 class Button:
+    __slots__ = ('rect', 'callback', 'hovered', 'enabled', 'font', 'text', 'text_surface', 'text_rect')
+
     def __init__(self, x, y, width, height, text, callback=None, font_size=20):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
         self.callback = callback
         self.hovered = False
         self.enabled = True
         self.font = pygame.font.Font(None, font_size)
+        self.set_text(text)
+
+    def set_text(self, text):
+        # The label is rendered once here, draw() only blits it
+        self.text = text
+        self.text_surface = self.font.render(text, True, TEXT_COLOR).convert_alpha()
+        self.text_rect = self.text_surface.get_rect(center=self.rect.center)
 
     def draw(self, screen):
         if self.enabled:
@@ -74,9 +86,7 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=5)
         pygame.draw.rect(screen, TEXT_COLOR, self.rect, 2, border_radius=5)
 
-        text_surface = self.font.render(self.text, True, TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.text_surface, self.text_rect)
 
     def handle_event(self, event):
         if not self.enabled:
@@ -90,6 +100,15 @@ class Button:
                 return True
         return False
 
+def _grow(mask):
+    """Return mask extended by one cell in all 8 directions"""
+    rows, cols = mask.shape
+    padded = np.pad(mask, 1)
+    grown = mask.copy()
+    for dr, dc in NEIGHBORS8:
+        grown |= padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return grown
+
 def get_username():
     """Get username via a simple pygame input box"""
     screen = pygame.display.set_mode((500, 200))
@@ -159,8 +178,14 @@ class MinesweeperGame:
         self.right_panel_width = 250
         self.padding = 20
 
+        # The leaderboard file is only parsed when the panel first needs it
+        self.leaderboard_file = os.path.join(os.path.dirname(__file__), 'leaderboard.json')
+        self._leaderboard = None
+        self._leaderboard_mtime = None
+        self.leaderboard_key = None
+        self.leaderboard_rows = None
+
         self.setup_window()
-        self.load_leaderboard()
         self.reset_game()
         self.create_ui_elements()
 
@@ -170,6 +195,19 @@ class MinesweeperGame:
     def setup_window(self):
         game_width = self.difficulty.cols * self.cell_size
         game_height = self.difficulty.rows * self.cell_size
+        self.board_width = game_width
+        self.board_height = game_height
+
+        # Cell rects and their centers only depend on the board size
+        size = self.cell_size - 2
+        self.cell_rects = [[pygame.Rect(self.padding + col * self.cell_size, self.top_panel_height + row * self.cell_size,
+                                        size, size)
+                            for col in range(self.difficulty.cols)]
+                           for row in range(self.difficulty.rows)]
+        self.cell_centers = [[rect.center for rect in rect_row] for rect_row in self.cell_rects]
+        self.flag_shapes = [[(((x - 5, y + 6), (x - 5, y - 6), (x + 6, y)), (x - 5, y - 6), (x - 5, y + 6))
+                             for x, y in center_row]
+                            for center_row in self.cell_centers]
 
         self.width = game_width + self.right_panel_width + self.padding * 3
         self.height = game_height + self.top_panel_height + self.padding * 2
@@ -181,6 +219,19 @@ class MinesweeperGame:
         self.font_medium = pygame.font.Font(None, 24)
         self.font_small = pygame.font.Font(None, 18)
 
+        # Text that never changes is rendered once per window instead of every frame
+        self.number_surfaces = {n: self.font_medium.render(str(n), True, color).convert_alpha()
+                                for n, color in NUMBER_COLORS.items()}
+        if self.cheat_mode:
+            title_text = f"MINESWEEPER - {self.username} 🎮"
+            title_color = CHEAT_COLOR
+        else:
+            title_text = f"MINESWEEPER - {self.username}"
+            title_color = TEXT_COLOR
+        self.title_surface = self.font_large.render(title_text, True, title_color).convert_alpha()
+        self.info_key = None
+        self.info_surface = None
+
     def create_ui_elements(self):
         # Mode buttons
         button_width = 80
@@ -240,8 +291,12 @@ class MinesweeperGame:
         self.create_ui_elements()
 
     def reset_game(self):
-        self.board = [[Cell(row, col) for col in range(self.difficulty.cols)]
-                      for row in range(self.difficulty.rows)]
+        # Board state as one (rows, cols) array per cell attribute
+        shape = (self.difficulty.rows, self.difficulty.cols)
+        self.is_mine = np.zeros(shape, bool)
+        self.is_revealed = np.zeros(shape, bool)
+        self.is_flagged = np.zeros(shape, bool)
+        self.adjacent_mines = np.zeros(shape, np.int8)
         self.game_over = False
         self.game_won = False
         self.first_click = True
@@ -253,99 +308,103 @@ class MinesweeperGame:
         self.hovered_cell = None
         self.score = 0
 
+        # Dirty-rect rendering: the next frame redraws everything, later ones only what changed
+        self.full_redraw = True
+        self.changed_cells = set()
+        self._dirty_rects = []
+        self.drawn_hover = None
+        self.drawn_hint = None
+        self.drawn_buttons = None
+
     def place_mines(self, exclude_row, exclude_col):
-        mines_placed = 0
-        exclude_cells = set()
-
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                r, c = exclude_row + dr, exclude_col + dc
-                if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                    exclude_cells.add((r, c))
-
-        while mines_placed < self.difficulty.mines:
-            row = random.randint(0, self.difficulty.rows - 1)
-            col = random.randint(0, self.difficulty.cols - 1)
-
-            if not self.board[row][col].is_mine and (row, col) not in exclude_cells:
-                self.board[row][col].is_mine = True
-                mines_placed += 1
-
-        # Calculate adjacent mines
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if not self.board[row][col].is_mine:
-                    count = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            r, c = row + dr, col + dc
-                            if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                                if self.board[r][c].is_mine:
-                                    count += 1
-                    self.board[row][col].adjacent_mines = count
+        rows, cols = self.difficulty.rows, self.difficulty.cols
+
+        # Mines go anywhere except the first clicked cell and its neighbors
+        candidates = np.ones((rows, cols), bool)
+        candidates[max(exclude_row - 1, 0):exclude_row + 2, max(exclude_col - 1, 0):exclude_col + 2] = False
+        picks = np.random.choice(np.flatnonzero(candidates), self.difficulty.mines, replace=False)
+        self.is_mine.flat[picks] = True
+        if self.cheat_mode:
+            # Cheat mode outlines every hidden mine
+            self.mark_changed(self.is_mine)
+
+        # Calculate adjacent mines: sum the 8 shifted copies of the padded mine mask
+        padded = np.pad(self.is_mine.astype(np.int8), 1)
+        counts = np.zeros((rows, cols), np.int8)
+        for dr, dc in NEIGHBORS8:
+            counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        self.adjacent_mines = np.where(self.is_mine, 0, counts).astype(np.int8)
 
     def reveal_cell(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed or cell.is_flagged:
+        if self.is_revealed[row, col] or self.is_flagged[row, col]:
             return
 
         # CHEAT MODE: Prevent clicking on mines
-        if self.cheat_mode and cell.is_mine:
+        if self.cheat_mode and self.is_mine[row, col]:
             return  # Silently ignore mine clicks
 
-        cell.is_revealed = True
+        self.is_revealed[row, col] = True
+        self.changed_cells.add((row, col))
 
         if self.first_click:
             self.first_click = False
             self.start_time = time.time()
             self.place_mines(row, col)
-            cell = self.board[row][col]
 
-        if cell.is_mine:
+        if self.is_mine[row, col]:
             self.game_over = True
             self.reveal_all_mines()
             return
 
-        if cell.adjacent_mines == 0:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    self.reveal_cell(row + dr, col + dc)
+        if self.adjacent_mines[row, col] == 0:
+            self.reveal_empty_region(row, col)
 
         self.check_win()
 
+    def reveal_empty_region(self, row, col):
+        # Grow the region of hidden empty cells connected to (row, col) one ring per step
+        # until it stops changing, then open it together with its numbered border
+        passable = (self.adjacent_mines == 0) & ~self.is_mine & ~self.is_revealed & ~self.is_flagged
+        region = np.zeros_like(passable)
+        region[row, col] = True
+        while True:
+            grown = region | (_grow(region) & passable)
+            if np.array_equal(grown, region):
+                break
+            region = grown
+
+        opened = _grow(region) & ~self.is_flagged & ~self.is_revealed
+        self.mark_changed(opened)
+        self.is_revealed |= opened
+
     def reveal_all_mines(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if self.board[row][col].is_mine:
-                    self.board[row][col].is_revealed = True
+        self.mark_changed(self.is_mine & ~self.is_revealed)
+        self.is_revealed |= self.is_mine
+
+    def mark_changed(self, mask):
+        rows, cols = np.nonzero(mask)
+        self.changed_cells.update(zip(rows.tolist(), cols.tolist()))
 
     def toggle_flag(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed:
+        if self.is_revealed[row, col]:
             return
 
-        cell.is_flagged = not cell.is_flagged
-        if cell.is_flagged:
+        self.is_flagged[row, col] = not self.is_flagged[row, col]
+        self.changed_cells.add((row, col))
+        if self.is_flagged[row, col]:
             self.flags_placed += 1
         else:
             self.flags_placed -= 1
 
     def check_win(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return
+        if np.any(~self.is_mine & ~self.is_revealed):
+            return
 
         self.game_won = True
         self.game_over = True
@@ -377,15 +436,11 @@ class MinesweeperGame:
             return
 
         # Find a safe cell
-        safe_cells = []
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_revealed and not cell.is_mine and not cell.is_flagged:
-                    safe_cells.append((row, col))
-
-        if safe_cells:
-            self.hint_cell = random.choice(safe_cells)
+        safe_cells = np.argwhere(~self.is_revealed & ~self.is_mine & ~self.is_flagged)
+
+        if len(safe_cells) > 0:
+            row, col = safe_cells[random.randrange(len(safe_cells))]
+            self.hint_cell = (int(row), int(col))
             self.hints_remaining -= 1
 
     def auto_win(self):
@@ -398,52 +453,63 @@ class MinesweeperGame:
             self.start_time = time.time()
 
         # Reveal all non-mine cells
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_mine:
-                    cell.is_revealed = True
+        self.mark_changed(~self.is_mine & ~self.is_revealed)
+        self.is_revealed |= ~self.is_mine
 
         # Trigger win
         self.check_win()
 
     def get_cell_from_pos(self, pos):
-        x, y = pos
-        x -= self.padding
-        y -= self.top_panel_height
-
-        if x < 0 or y < 0:
-            return None, None
-
-        col = x // self.cell_size
-        row = y // self.cell_size
-
-        if row >= self.difficulty.rows or col >= self.difficulty.cols:
-            return None, None
-
-        return row, col
+        x = pos[0] - self.padding
+        y = pos[1] - self.top_panel_height
+
+        # Bounds check in pixels so positions off the board skip the divisions
+        if 0 <= x < self.board_width and 0 <= y < self.board_height:
+            return y // self.cell_size, x // self.cell_size
+        return None, None
+
+    @property
+    def leaderboard(self):
+        # Reparse only when the file changed since it was last read or written
+        mtime = self.get_leaderboard_mtime()
+        if self._leaderboard is None or mtime != self._leaderboard_mtime:
+            self.load_leaderboard()
+            self._leaderboard_mtime = mtime
+        return self._leaderboard
+
+    @leaderboard.setter
+    def leaderboard(self, leaderboard):
+        self._leaderboard = leaderboard
+        self._leaderboard_mtime = self.get_leaderboard_mtime()
+        self.leaderboard_key = None
+
+    def get_leaderboard_mtime(self):
+        try:
+            return os.stat(self.leaderboard_file).st_mtime_ns
+        except OSError:
+            return None
 
     def load_leaderboard(self):
-        self.leaderboard_file = os.path.join(os.path.dirname(__file__), 'leaderboard.json')
+        self.leaderboard_key = None
         try:
             if os.path.exists(self.leaderboard_file):
-                with open(self.leaderboard_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.leaderboard_file, 'rb') as f:
+                    data = orjson.loads(f.read()) if orjson else json.load(f)
                     # Ensure all difficulty keys exist
-                    self.leaderboard = {
+                    self._leaderboard = {
                         "Easy": data.get("Easy", []),
                         "Medium": data.get("Medium", []),
                         "Hard": data.get("Hard", [])
                     }
             else:
-                self.leaderboard = {
+                self._leaderboard = {
                     "Easy": [],
                     "Medium": [],
                     "Hard": []
                 }
         except:
             # If file is corrupted, start fresh
-            self.leaderboard = {
+            self._leaderboard = {
                 "Easy": [],
                 "Medium": [],
                 "Hard": []
@@ -473,102 +539,148 @@ class MinesweeperGame:
         if diff_name not in self.leaderboard:
             self.leaderboard[diff_name] = []
 
-        self.leaderboard[diff_name].append(entry)
-        self.leaderboard[diff_name].sort(key=lambda x: x['score'], reverse=True)
-        self.leaderboard[diff_name] = self.leaderboard[diff_name][:10]  # Keep top 10
+        entries = self.leaderboard[diff_name]
+        if len(entries) >= 10 and entry['score'] <= entries[9]['score']:
+            return  # didn't make the top 10, nothing to save
+
+        # Entries stay sorted by score, so the new one is inserted after any equal scores
+        bisect.insort(entries, entry, key=lambda x: -x['score'])
+        del entries[10:]  # Keep top 10
+        self.full_redraw = True
 
-        with open(self.leaderboard_file, 'w') as f:
-            json.dump(self.leaderboard, f, indent=2)
+        # Write a compact copy next to the file and swap it in, so a crash can't leave it half written
+        tmp_file = self.leaderboard_file + '.tmp'
+        if orjson:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(self.leaderboard))
+        else:
+            with open(tmp_file, 'w') as f:
+                json.dump(self.leaderboard, f, separators=(',', ':'))
+        os.replace(tmp_file, self.leaderboard_file)
+        self._leaderboard_mtime = self.get_leaderboard_mtime()
+        self.leaderboard_key = None
 
     def draw(self):
-        self.screen.fill(BG_COLOR)
+        screen = self.screen
+        full = self.full_redraw
+        dirty = self._dirty_rects
 
-        # Draw title with username
-        if self.cheat_mode:
-            title_text = f"MINESWEEPER - {self.username} 🎮"
-            title_color = CHEAT_COLOR
-        else:
-            title_text = f"MINESWEEPER - {self.username}"
-            title_color = TEXT_COLOR
+        # Hover and hint outlines only need their old and new cells redrawn
+        hover = None if self.game_over else self.hovered_cell
+        for drawn, current in ((self.drawn_hover, hover), (self.drawn_hint, self.hint_cell)):
+            if drawn != current:
+                self.changed_cells.update(cell for cell in (drawn, current) if cell is not None)
+        self.drawn_hover = hover
+        self.drawn_hint = self.hint_cell
 
-        title = self.font_large.render(title_text, True, title_color)
-        self.screen.blit(title, (self.padding, self.padding))
+        button_looks = [(button.hovered, button.enabled) for button in self.buttons]
 
-        # Draw mode buttons
-        for button in self.buttons:
-            button.draw(self.screen)
+        if full:
+            screen.fill(BG_COLOR)
+
+            # Draw title with username
+            screen.blit(self.title_surface, (self.padding, self.padding))
+
+            # Draw mode buttons
+            for button in self.buttons:
+                button.draw(screen)
+        else:
+            for button, looks, drawn in zip(self.buttons, button_looks, self.drawn_buttons):
+                if looks != drawn:
+                    screen.fill(BG_COLOR, button.rect)
+                    button.draw(screen)
+                    dirty.append(button.rect)
+        self.drawn_buttons = button_looks
 
         # Draw game info
         info_y = self.padding + 95
         mines_left = self.difficulty.mines - self.flags_placed
-        info_text = f"Mines: {mines_left}   Time: {self.elapsed_time}s   Hints: {self.hints_remaining}"
 
-        if self.game_won:
-            if self.cheat_mode:
-                info_text += f"   🎉 WON! (Cheat - Not Saved)"
-            else:
-                info_text += f"   🎉 WON! Score: {self.score}"
-        elif self.game_over:
-            info_text += "   💥 GAME OVER"
-
-        info_surface = self.font_medium.render(info_text, True, TEXT_COLOR)
-        self.screen.blit(info_surface, (self.padding, info_y))
-
-        # Draw game board
-        board_x = self.padding
-        board_y = self.top_panel_height
-
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                x = board_x + col * self.cell_size
-                y = board_y + row * self.cell_size
-                rect = pygame.Rect(x, y, self.cell_size - 2, self.cell_size - 2)
-
-                # Check if this is the hint cell or hovered cell
-                is_hint = self.hint_cell and self.hint_cell == (row, col)
-                is_hovered = self.hovered_cell == (row, col)
-
-                # CHEAT MODE: Show mines with magenta border
-                show_mine_cheat = self.cheat_mode and cell.is_mine and not cell.is_revealed and not cell.is_flagged
-
-                if cell.is_revealed:
-                    pygame.draw.rect(self.screen, CELL_REVEALED, rect, border_radius=3)
-
-                    if cell.is_mine:
-                        pygame.draw.circle(self.screen, MINE_COLOR,
-                                         rect.center, self.cell_size // 4)
-                    elif cell.adjacent_mines > 0:
-                        color = NUMBER_COLORS[cell.adjacent_mines]
-                        text = self.font_medium.render(str(cell.adjacent_mines), True, color)
-                        text_rect = text.get_rect(center=rect.center)
-                        self.screen.blit(text, text_rect)
-                else:
-                    color = CELL_HOVER if is_hovered and not self.game_over else CELL_HIDDEN
-                    pygame.draw.rect(self.screen, color, rect, border_radius=3)
-
-                    # Draw cheat mode indicator
-                    if show_mine_cheat:
-                        pygame.draw.rect(self.screen, CHEAT_COLOR, rect, 3, border_radius=3)
-
-                    if is_hint:
-                        pygame.draw.rect(self.screen, HINT_COLOR, rect, 3, border_radius=3)
-
-                    if cell.is_flagged:
-                        flag_points = [
-                            (rect.centerx - 5, rect.centery + 6),
-                            (rect.centerx - 5, rect.centery - 6),
-                            (rect.centerx + 6, rect.centery)
-                        ]
-                        pygame.draw.polygon(self.screen, FLAG_COLOR, flag_points)
-                        pygame.draw.line(self.screen, TEXT_COLOR,
-                                       (rect.centerx - 5, rect.centery - 6),
-                                       (rect.centerx - 5, rect.centery + 6), 2)
-
-        # Draw leaderboard panel
-        self.draw_leaderboard()
+        # Only re-render the info line when one of the values shown in it changed
+        info_key = (mines_left, self.elapsed_time, self.hints_remaining, self.game_over, self.game_won, self.score)
+        if full or info_key != self.info_key:
+            if info_key != self.info_key:
+                info_text = f"Mines: {mines_left}   Time: {self.elapsed_time}s   Hints: {self.hints_remaining}"
 
-        pygame.display.flip()
+                if self.game_won:
+                    if self.cheat_mode:
+                        info_text += f"   🎉 WON! (Cheat - Not Saved)"
+                    else:
+                        info_text += f"   🎉 WON! Score: {self.score}"
+                elif self.game_over:
+                    info_text += "   💥 GAME OVER"
+
+                self.info_surface = self.font_medium.render(info_text, True, TEXT_COLOR).convert_alpha()
+                self.info_key = info_key
+            info_rect = pygame.Rect(0, info_y, self.width, self.top_panel_height - info_y)
+            screen.fill(BG_COLOR, info_rect)
+            screen.blit(self.info_surface, (self.padding, info_y))
+            dirty.append(info_rect)
+
+        # Draw game board, on partial frames only the cells that changed
+        if full:
+            self.changed_cells = {(row, col) for row in range(self.difficulty.rows)
+                                  for col in range(self.difficulty.cols)}
+
+        # Bound once, these run for every cell on a full redraw
+        draw_cell = self.draw_cell
+        cell_rects = self.cell_rects
+        for row, col in self.changed_cells:
+            # Rounded corners leave background showing, so clear the cell first
+            if not full:
+                rect = cell_rects[row][col]
+                screen.fill(BG_COLOR, rect)
+                dirty.append(rect)
+            draw_cell(row, col)
+        self.changed_cells.clear()
+
+        if full:
+            # Draw leaderboard panel
+            self.draw_leaderboard()
+            pygame.display.flip()
+            self.full_redraw = False
+        elif len(dirty) > MAX_UPDATE_RECTS:
+            pygame.display.update(dirty[0].unionall(dirty[1:]))
+        elif dirty:
+            pygame.display.update(dirty)
+        dirty.clear()
+
+    def draw_cell(self, row, col):
+        screen = self.screen
+        draw_rect = pygame.draw.rect
+        rect = self.cell_rects[row][col]
+        center = self.cell_centers[row][col]
+        is_mine = self.is_mine[row, col]
+        is_flagged = self.is_flagged[row, col]
+
+        # Check if this is the hint cell or hovered cell
+        is_hint = self.hint_cell and self.hint_cell == (row, col)
+        is_hovered = self.hovered_cell == (row, col)
+
+        if self.is_revealed[row, col]:
+            draw_rect(screen, CELL_REVEALED, rect, border_radius=3)
+
+            if is_mine:
+                pygame.draw.circle(screen, MINE_COLOR,
+                                 center, self.cell_size // 4)
+            elif self.adjacent_mines[row, col] > 0:
+                text = self.number_surfaces[self.adjacent_mines[row, col]]
+                screen.blit(text, text.get_rect(center=center))
+        else:
+            color = CELL_HOVER if is_hovered and not self.game_over else CELL_HIDDEN
+            draw_rect(screen, color, rect, border_radius=3)
+
+            # CHEAT MODE: Show mines with magenta border
+            if self.cheat_mode and is_mine and not is_flagged:
+                draw_rect(screen, CHEAT_COLOR, rect, 3, border_radius=3)
+
+            if is_hint:
+                draw_rect(screen, HINT_COLOR, rect, 3, border_radius=3)
+
+            if is_flagged:
+                flag_points, pole_top, pole_bottom = self.flag_shapes[row][col]
+                pygame.draw.polygon(screen, FLAG_COLOR, flag_points)
+                pygame.draw.line(screen, TEXT_COLOR, pole_top, pole_bottom, 2)
 
     def draw_leaderboard(self):
         panel_x = self.padding * 2 + self.difficulty.cols * self.cell_size
@@ -579,48 +691,85 @@ class MinesweeperGame:
         # Panel background
         pygame.draw.rect(self.screen, PANEL_BG, (panel_x, panel_y, panel_width, panel_height), border_radius=5)
 
+        # The panel text is rendered once per difficulty and leaderboard file version
+        leaderboard = self.leaderboard
+        key = (self.difficulty.display_name, self._leaderboard_mtime)
+        if key != self.leaderboard_key:
+            self.leaderboard_rows = self.render_leaderboard(leaderboard.get(self.difficulty.display_name, []))
+            self.leaderboard_key = key
+
+        self.screen.blits([(surf, (panel_x + x, panel_y + y)) for surf, x, y in self.leaderboard_rows])
+
+    def render_leaderboard(self, entries):
+        """Render the leaderboard panel text as (surface, x, y) relative to the panel"""
+        panel_width = self.right_panel_width
+        rows = []
+
         # Title
         title = self.font_medium.render("LEADERBOARD", True, TEXT_COLOR)
-        title_rect = title.get_rect(centerx=panel_x + panel_width // 2)
-        self.screen.blit(title, (title_rect.x, panel_y + 10))
+        title_rect = title.get_rect(centerx=panel_width // 2)
+        rows.append((title, title_rect.x, 10))
 
         # Difficulty tabs
         diff_name = self.font_small.render(f"{self.difficulty.display_name} Mode", True, BUTTON_COLOR)
-        diff_rect = diff_name.get_rect(centerx=panel_x + panel_width // 2)
-        self.screen.blit(diff_name, (diff_rect.x, panel_y + 40))
+        diff_rect = diff_name.get_rect(centerx=panel_width // 2)
+        rows.append((diff_name, diff_rect.x, 40))
 
         # Leaderboard entries
-        entries = self.leaderboard.get(self.difficulty.display_name, [])
-        entry_y = panel_y + 70
+        entry_y = 70
 
         for i, entry in enumerate(entries[:10]):
             rank_text = f"{i+1}."
             username = entry.get('username', 'Player')[:10]  # Limit username length
             score_text = f"{entry['score']} pts"
 
-            rank_surf = self.font_small.render(rank_text, True, TEXT_COLOR)
-            name_surf = self.font_small.render(username, True, BUTTON_COLOR)
-            score_surf = self.font_small.render(score_text, True, TEXT_COLOR)
-
-            self.screen.blit(rank_surf, (panel_x + 10, entry_y))
-            self.screen.blit(name_surf, (panel_x + 35, entry_y))
-            self.screen.blit(score_surf, (panel_x + 150, entry_y))
+            rows.append((self.font_small.render(rank_text, True, TEXT_COLOR), 10, entry_y))
+            rows.append((self.font_small.render(username, True, BUTTON_COLOR), 35, entry_y))
+            rows.append((self.font_small.render(score_text, True, TEXT_COLOR), 150, entry_y))
 
             entry_y += 25
 
         if not entries:
             no_scores = self.font_small.render("No scores yet!", True, TEXT_COLOR)
-            no_scores_rect = no_scores.get_rect(centerx=panel_x + panel_width // 2)
-            self.screen.blit(no_scores, (no_scores_rect.x, panel_y + 100))
+            no_scores_rect = no_scores.get_rect(centerx=panel_width // 2)
+            rows.append((no_scores, no_scores_rect.x, 100))
+
+        return rows
 
     def run(self):
-        clock = pygame.time.Clock()
         running = True
 
+        # Let SDL drop every event the game loop ignores before it reaches the queue. This is
+        # done here rather than at init so the username box still gets its text input.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION,
+                                  pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE])
+
+        # The loop below only draws after something happened, so show the board right away
+        self.draw()
+
         while running:
-            for event in pygame.event.get():
+            # Sleep until input arrives, or until the timer display has to advance
+            if self.start_time and not self.game_over:
+                next_tick = self.start_time + self.elapsed_time + 1
+                first = pygame.event.wait(max(1, int((next_tick - time.time()) * 1000)))
+            else:
+                first = pygame.event.wait()
+
+            dirty = False
+            for event in [first] + pygame.event.get():
+                # Motion events only wake the loop up, hovering polls the pointer once below
+                if event.type == pygame.MOUSEMOTION:
+                    continue
+
+                # Clicks and keys can change anything, draw() works out what exactly
+                if event.type != pygame.NOEVENT:
+                    dirty = True
+
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.full_redraw = True
 
                 # Handle button events - stop propagation if button was clicked
                 button_clicked = False
@@ -629,11 +778,6 @@ class MinesweeperGame:
                         button_clicked = True
                         break
 
-                # Mouse motion for both buttons and game board
-                if event.type == pygame.MOUSEMOTION:
-                    row, col = self.get_cell_from_pos(event.pos)
-                    self.hovered_cell = (row, col) if row is not None else None
-
                 # Only process game clicks if no button was clicked
                 if not button_clicked:
                     if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
@@ -654,12 +798,31 @@ class MinesweeperGame:
                     elif event.key == pygame.K_ESCAPE:
                         running = False
 
+            # Hover state for both buttons and game board
+            mouse_pos = pygame.mouse.get_pos()
+            for button in self.buttons:
+                if button.enabled:
+                    hovered = bool(button.rect.collidepoint(mouse_pos))
+                    if hovered != button.hovered:
+                        button.hovered = hovered
+                        dirty = True
+            row, col = self.get_cell_from_pos(mouse_pos)
+            hovered = (row, col) if row is not None else None
+            # Moving within the same cell leaves nothing to redraw
+            if hovered != self.hovered_cell:
+                self.hovered_cell = hovered
+                dirty = True
+
             # Update timer
             if self.start_time and not self.game_over:
-                self.elapsed_time = int(time.time() - self.start_time)
-
-            self.draw()
-            clock.tick(60)
+                elapsed_time = int(time.time() - self.start_time)
+                if elapsed_time != self.elapsed_time:
+                    self.elapsed_time = elapsed_time
+                    dirty = True
+
+            # Nothing visible changed, e.g. the pointer moved within a cell
+            if dirty:
+                self.draw()
 
         pygame.quit()
 
@@ -1,16 +1,29 @@
 import pygame
-import random
+import numpy as np
+import functools
 import time
 import json
 import os
+import queue
 from datetime import datetime
 from enum import Enum
 import socketio
 import requests
-from threading import Thread
+from threading import Thread, Event
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, without it the board kernels run as plain Python
+    njit = None
 
 # Initialize Pygame
 pygame.init()
+# Keep SDL from queueing event types the dialogs and the game never look at. TEXTINPUT stays
+# allowed because the text boxes read the typed characters from KEYDOWN's unicode, and
+# VIDEOEXPOSE wakes the dialogs up to repaint an uncovered window.
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEMOTION,
+                          pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE])
 
 # Colors - Modern Dark Theme
 BG_COLOR = (40, 44, 52)
@@ -40,8 +53,15 @@ NUMBER_COLORS = {
     8: (44, 62, 80)     # Darker gray
 }
 
+# Offsets of the 8 cells around a cell
+NEIGHBORS8 = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+# Above this many changed cells one bounding rect is cheaper to push than the separate ones
+MAX_UPDATE_RECTS = 20
+
 # Server configuration - Railway deployment
 SERVER_URL = os.environ.get('SERVER_URL', 'https://minesweeper-server-production-ecec.up.railway.app')
+# Seconds to wait for the server to answer a connect, create or join
+RESPONSE_TIMEOUT = 5.0
 
 class Difficulty(Enum):
     EASY = ("Easy", 9, 9, 10)
@@ -54,23 +74,85 @@ class Difficulty(Enum):
         self.cols = cols
         self.mines = mines
 
-class Cell:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.adjacent_mines = 0
+def _neighbor_table(rows, cols):
+    """Flat indices of every cell's in-bounds neighbors in CSR form: the neighbors of
+    cell i are neighbors[offsets[i]:offsets[i + 1]]"""
+    offsets = np.zeros(rows * cols + 1, np.int32)
+    neighbors = []
+    for row in range(rows):
+        for col in range(cols):
+            for r in range(max(row - 1, 0), min(row + 2, rows)):
+                for c in range(max(col - 1, 0), min(col + 2, cols)):
+                    if r != row or c != col:
+                        neighbors.append(r * cols + c)
+            offsets[row * cols + col + 1] = len(neighbors)
+    return offsets, np.array(neighbors, np.int32)
+
+def _flood_fill(is_revealed, is_flagged, adjacent_mines, start, neighbor_offsets, neighbors):
+    """Open the region around the empty cell start: every unflagged neighbor is revealed and
+    the empty ones are expanded in turn. Works on the flattened board arrays and returns the
+    flat indices of the cells it opened"""
+    opened = np.empty(is_revealed.size, np.int32)
+    count = 0
+    # Every cell is pushed at most once, when it gets revealed
+    stack = np.empty(is_revealed.size + 1, np.int32)
+    stack[0] = start
+    size = 1
+    while size > 0:
+        size -= 1
+        cell = stack[size]
+        for k in range(neighbor_offsets[cell], neighbor_offsets[cell + 1]):
+            i = neighbors[k]
+            if is_revealed[i] or is_flagged[i]:
+                continue
+            is_revealed[i] = True
+            opened[count] = i
+            count += 1
+            if adjacent_mines[i] == 0:
+                stack[size] = i
+                size += 1
+    return opened[:count]
+
+if njit is not None:
+    _flood_fill = njit(cache=True, nogil=True)(_flood_fill)
+    # Compile now rather than on the first click of the first game
+    _flood_fill(np.zeros(1, bool), np.zeros(1, bool), np.zeros(1, np.int8), 0, *_neighbor_table(1, 1))
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    """Default font at the given size, loaded once and shared by every dialog and the game"""
+    return pygame.font.Font(None, size)
+
+@functools.lru_cache(maxsize=64)
+def render_text(font, text, color):
+    """Rendered panel string, most of them repeat from frame to frame and are only rasterized when they change"""
+    return font.render(text, True, color).convert_alpha()
 
 class Button:
     def __init__(self, x, y, width, height, text, callback=None, font_size=20):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        # Plain int bounds for the per-event hit test, buttons never move once created
+        self.bounds = (x, y, x + width, y + height)
         self.callback = callback
         self.hovered = False
         self.enabled = True
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
+        self.set_text(text)
+
+    def set_text(self, text):
+        # The button is rendered once per fill color here, draw() only blits the one it needs
+        self.text = text
+        text_surface = self.font.render(text, True, TEXT_COLOR)
+        self.state_surfaces = {color: self.render_state(color, text_surface)
+                               for color in (BUTTON_COLOR, BUTTON_HOVER, BUTTON_DISABLED)}
+
+    def render_state(self, color, text_surface):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, color, rect, border_radius=5)
+        pygame.draw.rect(surface, TEXT_COLOR, rect, 2, border_radius=5)
+        surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return surface.convert_alpha()
 
     def draw(self, screen):
         if self.enabled:
@@ -78,31 +160,41 @@ class Button:
         else:
             color = BUTTON_DISABLED
 
-        pygame.draw.rect(screen, color, self.rect, border_radius=5)
-        pygame.draw.rect(screen, TEXT_COLOR, self.rect, 2, border_radius=5)
-
-        text_surface = self.font.render(self.text, True, TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.state_surfaces[color], self.rect)
 
     def handle_event(self, event):
         if not self.enabled:
             return False
 
         if event.type == pygame.MOUSEMOTION:
-            self.hovered = self.rect.collidepoint(event.pos)
+            ex, ey = event.pos
+            x0, y0, x1, y1 = self.bounds
+            self.hovered = x0 <= ex < x1 and y0 <= ey < y1
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos) and self.callback:
+            ex, ey = event.pos
+            x0, y0, x1, y1 = self.bounds
+            if x0 <= ex < x1 and y0 <= ey < y1 and self.callback:
                 self.callback()
                 return True
         return False
 
+def get_display_username(username):
+    """Get username for sending to server/leaderboard - masks cheat username"""
+    if username == "ICantLose":
+        return "Player 1"
+    return username
+
+def close_window(event):
+    """QUIT handler shared by the dialogs, closing any of them exits the program"""
+    pygame.quit()
+    exit()
+
 def get_username():
     """Get username via a simple pygame input box"""
     screen = pygame.display.set_mode((500, 200))
     pygame.display.set_caption('Enter Username')
 
-    font = pygame.font.Font(None, 32)
+    font = get_font(32)
     input_box = pygame.Rect(50, 100, 400, 40)
     color_inactive = pygame.Color('lightskyblue3')
     color_active = pygame.Color('dodgerblue2')
@@ -111,32 +203,37 @@ def get_username():
     text = ''
     done = False
 
-    while not done:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if input_box.collidepoint(event.pos):
-                    active = not active
-                else:
-                    active = False
-                color = color_active if active else color_inactive
-            if event.type == pygame.KEYDOWN:
-                if active:
-                    if event.key == pygame.K_RETURN:
-                        done = True
-                    elif event.key == pygame.K_BACKSPACE:
-                        text = text[:-1]
-                    else:
-                        if len(text) < 20:
-                            text += event.unicode
+    # Only the typed text changes between frames
+    title = font.render('Enter Your Username:', True, TEXT_COLOR)
+    title_rect = title.get_rect(center=(250, 40))
+    inst = get_font(20).render('Press ENTER when done', True, TEXT_COLOR)
+    inst_rect = inst.get_rect(center=(250, 160))
+
+    def on_click(event):
+        nonlocal active, color
+        if input_box.collidepoint(event.pos):
+            active = not active
+        else:
+            active = False
+        color = color_active if active else color_inactive
+
+    def on_key(event):
+        nonlocal done, text
+        if active:
+            if event.key == pygame.K_RETURN:
+                done = True
+            elif event.key == pygame.K_BACKSPACE:
+                text = text[:-1]
+            else:
+                if len(text) < 20:
+                    text += event.unicode
+
+    handlers = {pygame.QUIT: close_window, pygame.MOUSEBUTTONDOWN: on_click, pygame.KEYDOWN: on_key}
 
+    while not done:
         screen.fill(BG_COLOR)
 
         # Title
-        title = font.render('Enter Your Username:', True, TEXT_COLOR)
-        title_rect = title.get_rect(center=(250, 40))
         screen.blit(title, title_rect)
 
         # Input box
@@ -147,13 +244,16 @@ def get_username():
         pygame.draw.rect(screen, color, input_box, 2, border_radius=5)
 
         # Instructions
-        inst_font = pygame.font.Font(None, 20)
-        inst = inst_font.render('Press ENTER when done', True, TEXT_COLOR)
-        inst_rect = inst.get_rect(center=(250, 160))
         screen.blit(inst, inst_rect)
 
         pygame.display.flip()
 
+        # Nothing changes on screen until an event arrives, so sleep until one does
+        for event in [pygame.event.wait()] + pygame.event.get():
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
+
     return text if text else "Player"
 
 def choose_game_mode():
@@ -161,46 +261,45 @@ def choose_game_mode():
     screen = pygame.display.set_mode((600, 350))
     pygame.display.set_caption('Choose Game Mode')
 
-    font_large = pygame.font.Font(None, 48)
-    font_medium = pygame.font.Font(None, 32)
+    font_large = get_font(48)
+    font_medium = get_font(32)
 
     solo_btn = Button(150, 150, 120, 50, "Solo", font_size=32)
     multi_btn = Button(330, 150, 120, 50, "Multiplayer", font_size=24)
     back_btn = Button(200, 240, 200, 50, "Back", font_size=28)
 
+    title = font_large.render('Choose Game Mode', True, TEXT_COLOR)
+    title_rect = title.get_rect(center=(300, 60))
+
     choice = None
     running = True
-    clock = pygame.time.Clock()
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-            # Update button hover states
-            if event.type == pygame.MOUSEMOTION:
-                solo_btn.hovered = solo_btn.rect.collidepoint(event.pos)
-                multi_btn.hovered = multi_btn.rect.collidepoint(event.pos)
-                back_btn.hovered = back_btn.rect.collidepoint(event.pos)
-
-            # Check for button clicks
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if solo_btn.rect.collidepoint(event.pos):
-                    choice = "solo"
-                    running = False
-                elif multi_btn.rect.collidepoint(event.pos):
-                    choice = "multiplayer"
-                    running = False
-                elif back_btn.rect.collidepoint(event.pos):
-                    choice = "back"
-                    running = False
+    # Update button hover states
+    def on_motion(event):
+        for button in (solo_btn, multi_btn, back_btn):
+            button.handle_event(event)
 
+    # Check for button clicks
+    def on_click(event):
+        nonlocal choice, running
+        if event.button != 1:
+            return
+        if solo_btn.rect.collidepoint(event.pos):
+            choice = "solo"
+            running = False
+        elif multi_btn.rect.collidepoint(event.pos):
+            choice = "multiplayer"
+            running = False
+        elif back_btn.rect.collidepoint(event.pos):
+            choice = "back"
+            running = False
+
+    handlers = {pygame.QUIT: close_window, pygame.MOUSEMOTION: on_motion, pygame.MOUSEBUTTONDOWN: on_click}
+
+    while running:
         screen.fill(BG_COLOR)
 
         # Title
-        title = font_large.render('Choose Game Mode', True, TEXT_COLOR)
-        title_rect = title.get_rect(center=(300, 60))
         screen.blit(title, title_rect)
 
         # Draw buttons
@@ -209,7 +308,12 @@ def choose_game_mode():
         back_btn.draw(screen)
 
         pygame.display.flip()
-        clock.tick(60)
+
+        # Nothing changes on screen until an event arrives, so sleep until one does
+        for event in [pygame.event.wait()] + pygame.event.get():
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
 
     return choice
 
@@ -218,46 +322,45 @@ def multiplayer_lobby():
     screen = pygame.display.set_mode((600, 400))
     pygame.display.set_caption('Multiplayer Lobby')
 
-    font_large = pygame.font.Font(None, 48)
-    font_medium = pygame.font.Font(None, 24)
+    font_large = get_font(48)
+    font_medium = get_font(24)
 
     create_btn = Button(200, 150, 200, 50, "Create Room", font_size=28)
     join_btn = Button(200, 220, 200, 50, "Join Room", font_size=28)
     back_btn = Button(200, 290, 200, 50, "Back", font_size=28)
 
+    title = font_large.render('Multiplayer Lobby', True, TEXT_COLOR)
+    title_rect = title.get_rect(center=(300, 60))
+
     choice = None
     running = True
-    clock = pygame.time.Clock()
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-            # Update button hover states
-            if event.type == pygame.MOUSEMOTION:
-                create_btn.hovered = create_btn.rect.collidepoint(event.pos)
-                join_btn.hovered = join_btn.rect.collidepoint(event.pos)
-                back_btn.hovered = back_btn.rect.collidepoint(event.pos)
-
-            # Check for button clicks
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if create_btn.rect.collidepoint(event.pos):
-                    choice = "create"
-                    running = False
-                elif join_btn.rect.collidepoint(event.pos):
-                    choice = "join"
-                    running = False
-                elif back_btn.rect.collidepoint(event.pos):
-                    choice = "back"
-                    running = False
+    # Update button hover states
+    def on_motion(event):
+        for button in (create_btn, join_btn, back_btn):
+            button.handle_event(event)
 
+    # Check for button clicks
+    def on_click(event):
+        nonlocal choice, running
+        if event.button != 1:
+            return
+        if create_btn.rect.collidepoint(event.pos):
+            choice = "create"
+            running = False
+        elif join_btn.rect.collidepoint(event.pos):
+            choice = "join"
+            running = False
+        elif back_btn.rect.collidepoint(event.pos):
+            choice = "back"
+            running = False
+
+    handlers = {pygame.QUIT: close_window, pygame.MOUSEMOTION: on_motion, pygame.MOUSEBUTTONDOWN: on_click}
+
+    while running:
         screen.fill(BG_COLOR)
 
         # Title
-        title = font_large.render('Multiplayer Lobby', True, TEXT_COLOR)
-        title_rect = title.get_rect(center=(300, 60))
         screen.blit(title, title_rect)
 
         # Draw buttons
@@ -266,7 +369,12 @@ def multiplayer_lobby():
         back_btn.draw(screen)
 
         pygame.display.flip()
-        clock.tick(60)
+
+        # Nothing changes on screen until an event arrives, so sleep until one does
+        for event in [pygame.event.wait()] + pygame.event.get():
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
 
     return choice
 
@@ -275,7 +383,7 @@ def get_room_code():
     screen = pygame.display.set_mode((500, 200))
     pygame.display.set_caption('Enter Room Code')
 
-    font = pygame.font.Font(None, 48)
+    font = get_font(48)
     input_box = pygame.Rect(150, 100, 200, 50)
     color_inactive = pygame.Color('lightskyblue3')
     color_active = pygame.Color('dodgerblue2')
@@ -284,33 +392,37 @@ def get_room_code():
     text = ''
     done = False
 
-    while not done:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if input_box.collidepoint(event.pos):
-                    active = not active
-                else:
-                    active = False
-                color = color_active if active else color_inactive
-            if event.type == pygame.KEYDOWN:
-                if active:
-                    if event.key == pygame.K_RETURN:
-                        done = True
-                    elif event.key == pygame.K_BACKSPACE:
-                        text = text[:-1]
-                    else:
-                        if len(text) < 6 and event.unicode.isalnum():
-                            text += event.unicode.upper()
+    # Only the typed code changes between frames
+    title = get_font(32).render('Enter Room Code:', True, TEXT_COLOR)
+    title_rect = title.get_rect(center=(250, 40))
+    inst = get_font(20).render('Press ENTER when done', True, TEXT_COLOR)
+    inst_rect = inst.get_rect(center=(250, 160))
+
+    def on_click(event):
+        nonlocal active, color
+        if input_box.collidepoint(event.pos):
+            active = not active
+        else:
+            active = False
+        color = color_active if active else color_inactive
+
+    def on_key(event):
+        nonlocal done, text
+        if active:
+            if event.key == pygame.K_RETURN:
+                done = True
+            elif event.key == pygame.K_BACKSPACE:
+                text = text[:-1]
+            else:
+                if len(text) < 6 and event.unicode.isalnum():
+                    text += event.unicode.upper()
+
+    handlers = {pygame.QUIT: close_window, pygame.MOUSEBUTTONDOWN: on_click, pygame.KEYDOWN: on_key}
 
+    while not done:
         screen.fill(BG_COLOR)
 
         # Title
-        title_font = pygame.font.Font(None, 32)
-        title = title_font.render('Enter Room Code:', True, TEXT_COLOR)
-        title_rect = title.get_rect(center=(250, 40))
         screen.blit(title, title_rect)
 
         # Input box
@@ -321,13 +433,16 @@ def get_room_code():
         pygame.draw.rect(screen, color, input_box, 2, border_radius=5)
 
         # Instructions
-        inst_font = pygame.font.Font(None, 20)
-        inst = inst_font.render('Press ENTER when done', True, TEXT_COLOR)
-        inst_rect = inst.get_rect(center=(250, 160))
         screen.blit(inst, inst_rect)
 
         pygame.display.flip()
 
+        # Nothing changes on screen until an event arrives, so sleep until one does
+        for event in [pygame.event.wait()] + pygame.event.get():
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
+
     return text if text else None
 
 def choose_multiplayer_game_mode():
@@ -335,47 +450,51 @@ def choose_multiplayer_game_mode():
     screen = pygame.display.set_mode((700, 500))
     pygame.display.set_caption('Choose Multiplayer Mode')
 
-    font_large = pygame.font.Font(None, 48)
-    font_medium = pygame.font.Font(None, 24)
-    font_small = pygame.font.Font(None, 18)
+    font_large = get_font(48)
+    font_medium = get_font(24)
+    font_small = get_font(18)
 
     luck_btn = Button(150, 200, 180, 60, "Luck Mode", font_size=28)
     standard_btn = Button(370, 200, 180, 60, "Standard Mode", font_size=24)
     back_btn = Button(250, 420, 200, 50, "Back", font_size=28)
 
+    # Title and mode descriptions never change while the dialog is open
+    title = font_large.render('Choose Game Mode', True, TEXT_COLOR)
+    title_rect = title.get_rect(center=(350, 50))
+    luck_desc1 = font_small.render("Turn-based: One click per turn", True, TEXT_COLOR)
+    luck_desc2 = font_small.render("No numbers shown - pure luck!", True, TEXT_COLOR)
+    standard_desc1 = font_small.render("Race Mode: Normal minesweeper", True, TEXT_COLOR)
+    standard_desc2 = font_small.render("First to finish wins!", True, TEXT_COLOR)
+
     choice = None
     running = True
-    clock = pygame.time.Clock()
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-            # Update button hover states
-            if event.type == pygame.MOUSEMOTION:
-                luck_btn.hovered = luck_btn.rect.collidepoint(event.pos)
-                standard_btn.hovered = standard_btn.rect.collidepoint(event.pos)
-                back_btn.hovered = back_btn.rect.collidepoint(event.pos)
-
-            # Check for button clicks
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if luck_btn.rect.collidepoint(event.pos):
-                    choice = "luck"
-                    running = False
-                elif standard_btn.rect.collidepoint(event.pos):
-                    choice = "standard"
-                    running = False
-                elif back_btn.rect.collidepoint(event.pos):
-                    choice = "back"
-                    running = False
+    # Update button hover states
+    def on_motion(event):
+        for button in (luck_btn, standard_btn, back_btn):
+            button.handle_event(event)
+
+    # Check for button clicks
+    def on_click(event):
+        nonlocal choice, running
+        if event.button != 1:
+            return
+        if luck_btn.rect.collidepoint(event.pos):
+            choice = "luck"
+            running = False
+        elif standard_btn.rect.collidepoint(event.pos):
+            choice = "standard"
+            running = False
+        elif back_btn.rect.collidepoint(event.pos):
+            choice = "back"
+            running = False
+
+    handlers = {pygame.QUIT: close_window, pygame.MOUSEMOTION: on_motion, pygame.MOUSEBUTTONDOWN: on_click}
 
+    while running:
         screen.fill(BG_COLOR)
 
         # Title
-        title = font_large.render('Choose Game Mode', True, TEXT_COLOR)
-        title_rect = title.get_rect(center=(350, 50))
         screen.blit(title, title_rect)
 
         # Draw buttons
@@ -384,18 +503,19 @@ def choose_multiplayer_game_mode():
         back_btn.draw(screen)
 
         # Descriptions
-        luck_desc1 = font_small.render("Turn-based: One click per turn", True, TEXT_COLOR)
-        luck_desc2 = font_small.render("No numbers shown - pure luck!", True, TEXT_COLOR)
         screen.blit(luck_desc1, (150, 270))
         screen.blit(luck_desc2, (150, 290))
 
-        standard_desc1 = font_small.render("Race Mode: Normal minesweeper", True, TEXT_COLOR)
-        standard_desc2 = font_small.render("First to finish wins!", True, TEXT_COLOR)
         screen.blit(standard_desc1, (370, 270))
         screen.blit(standard_desc2, (370, 290))
 
         pygame.display.flip()
-        clock.tick(60)
+
+        # Nothing changes on screen until an event arrives, so sleep until one does
+        for event in [pygame.event.wait()] + pygame.event.get():
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
 
     return choice
 
@@ -405,12 +525,23 @@ class NetworkManager:
         self.connected = False
         self.room_code = None
         self.players = []
+        # Bumped whenever players is replaced, so the game can tell when the standings changed
+        self.players_version = 0
         self.game_started = False
         self.board_seed = None
         self.game_mode = "standard"  # "standard" or "luck"
         self.current_turn = None  # For Luck Mode: username of player whose turn it is
         self.game_result = None  # "won", "lost", or None
 
+        # Set by the socketio handlers so requests return as soon as the server answers
+        self.connected_event = Event()
+        self.room_created_event = Event()
+        self.room_joined_event = Event()
+
+        # Emits are written to the socket by a sender thread, so the game loop never blocks on I/O
+        self.outbox = queue.Queue()
+        Thread(target=self.send_loop, daemon=True).start()
+
         # Setup event handlers
         self.setup_handlers()
 
@@ -419,21 +550,26 @@ class NetworkManager:
         def on_connected(data):
             print(f"Connected to server: {data}")
             self.connected = True
+            self.connected_event.set()
 
         @self.sio.on('room_created')
         def on_room_created(data):
             self.room_code = data['room_code']
             print(f"Room created: {self.room_code}")
+            self.room_created_event.set()
 
         @self.sio.on('room_joined')
         def on_room_joined(data):
             self.room_code = data['room_code']
             self.players = data['players']
+            self.players_version += 1
             print(f"Joined room: {self.room_code}")
+            self.room_joined_event.set()
 
         @self.sio.on('player_joined')
         def on_player_joined(data):
             self.players = data['players']
+            self.players_version += 1
             print(f"Player joined: {data['username']}")
 
         @self.sio.on('player_left')
@@ -443,6 +579,7 @@ class NetworkManager:
         @self.sio.on('player_ready_update')
         def on_ready_update(data):
             self.players = data['players']
+            self.players_version += 1
 
         @self.sio.on('game_start')
         def on_game_start(data):
@@ -459,6 +596,7 @@ class NetworkManager:
         @self.sio.on('player_finished')
         def on_player_finished(data):
             self.players = data['players']
+            self.players_version += 1
             print(f"Player {data['username']} finished! Score: {data['score']}")
 
         @self.sio.on('game_ended')
@@ -490,49 +628,69 @@ class NetworkManager:
         @self.sio.on('error')
         def on_error(data):
             print(f"Error: {data['message']}")
+            # A rejected create or join gets no other reply, stop waiting for one
+            self.room_created_event.set()
+            self.room_joined_event.set()
 
     def connect(self):
         try:
+            self.connected_event.clear()
             self.sio.connect(SERVER_URL)
-            time.sleep(0.5)  # Wait for connection
-            return True
+            if self.connected_event.wait(RESPONSE_TIMEOUT):
+                return True
+            # No greeting from the server, close the transport instead of leaving the session open
+            self.sio.disconnect()
+            return False
         except Exception as e:
             print(f"Failed to connect to server: {e}")
             return False
 
+    def send_loop(self):
+        while True:
+            event, data = self.outbox.get()
+            try:
+                self.sio.emit(event, data)
+            except socketio.exceptions.SocketIOError as e:
+                print(f"Failed to send {event}: {e}")
+
+    def emit(self, event, data):
+        self.outbox.put((event, data))
+
     def disconnect(self):
         if self.connected:
             self.sio.disconnect()
 
     def create_room(self, username, difficulty="Medium", game_mode="standard"):
-        self.sio.emit('create_room', {
+        self.room_created_event.clear()
+        self.emit('create_room', {
             "username": username,
             "difficulty": difficulty,
             "max_players": 3,
             "game_mode": game_mode
         })
         self.game_mode = game_mode
-        time.sleep(0.5)  # Wait for response
+        self.room_created_event.wait(RESPONSE_TIMEOUT)
 
     def join_room(self, room_code, username):
-        self.sio.emit('join_room', {
+        self.room_joined_event.clear()
+        self.emit('join_room', {
             "room_code": room_code,
             "username": username
         })
-        time.sleep(0.5)  # Wait for response
+        self.room_joined_event.wait(RESPONSE_TIMEOUT)
 
     def mark_ready(self):
-        self.sio.emit('player_ready', {})
+        self.emit('player_ready', {})
 
     def send_action(self, action, row, col):
-        self.sio.emit('game_action', {
+        self.emit('game_action', {
             "action": action,
             "row": row,
             "col": col
         })
 
     def send_finished(self, score, time_taken):
-        self.sio.emit('game_finished', {
+        self.emit('game_finished', {
             "score": score,
             "time": time_taken
         })
@@ -544,6 +702,7 @@ class MinesweeperGame:
         self.network = network_manager
         # Block "Player 1" from being the cheat username - only "ICantLose" works
         self.cheat_mode = (username == "ICantLose")
+        self.display_username = get_display_username(username)
         self.difficulty = Difficulty.MEDIUM
         self.cell_size = 30
         self.top_panel_height = 180  # Increased for multiplayer info
@@ -553,18 +712,17 @@ class MinesweeperGame:
         self.show_game_result = False  # Show win/loss screen overlay
 
         self.setup_window()
+        self.leaderboard_version = 0
         self.load_leaderboard()
         self.reset_game()
         self.create_ui_elements()
 
-        if self.cheat_mode:
-            print(f"\n🎮 CHEAT MODE ACTIVATED! {self.username} can see all mines! 🎮\n")
+        # Leaderboard writes and submissions run on a writer thread, the game thread only queues them
+        self.persist_queue = queue.Queue()
+        Thread(target=self.persist_loop, daemon=True).start()
 
-    def get_display_username(self):
-        """Get username for sending to server/leaderboard - masks cheat username"""
         if self.cheat_mode:
-            return "Player 1"
-        return self.username
+            print(f"\n🎮 CHEAT MODE ACTIVATED! {self.username} can see all mines! 🎮\n")
 
     def setup_window(self):
         game_width = self.difficulty.cols * self.cell_size
@@ -576,9 +734,59 @@ class MinesweeperGame:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption(f'Minesweeper - {self.username}')
 
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_medium = pygame.font.Font(None, 24)
-        self.font_small = pygame.font.Font(None, 18)
+        self.font_large = get_font(36)
+        self.font_medium = get_font(24)
+        self.font_small = get_font(18)
+
+        # Every piece of a cell is rendered once per window, repainting a cell only blits sprites
+        size = self.cell_size - 2
+        center = (size // 2, size // 2)
+        self.number_sprites = {}
+        for n, color in NUMBER_COLORS.items():
+            glyph = self.font_medium.render(str(n), True, color).convert_alpha()
+            self.number_sprites[n] = (glyph, glyph.get_rect(center=center).topleft)
+        self.cell_hidden_surf = self.render_cell_surface(CELL_HIDDEN)
+        self.cell_hover_surf = self.render_cell_surface(CELL_HOVER)
+        self.cell_revealed_surf = self.render_cell_surface(CELL_REVEALED)
+        self.cell_mine_surf = self.cell_revealed_surf.copy()
+        pygame.draw.circle(self.cell_mine_surf, MINE_COLOR, center, self.cell_size // 4)
+
+        self.cheat_outline_surf = self.render_cell_overlay()
+        pygame.draw.rect(self.cheat_outline_surf, CHEAT_COLOR, (0, 0, size, size), 3, border_radius=3)
+        self.hint_outline_surf = self.render_cell_overlay()
+        pygame.draw.rect(self.hint_outline_surf, HINT_COLOR, (0, 0, size, size), 3, border_radius=3)
+        self.flag_surf = self.render_cell_overlay()
+        cx, cy = center
+        pygame.draw.polygon(self.flag_surf, FLAG_COLOR, [(cx - 5, cy + 6), (cx - 5, cy - 6), (cx + 6, cy)])
+        pygame.draw.line(self.flag_surf, TEXT_COLOR, (cx - 5, cy - 6), (cx - 5, cy + 6), 2)
+
+        # Dims the whole window behind the multiplayer result, built once per window size
+        self.dim_overlay = pygame.Surface((self.width, self.height)).convert()
+        self.dim_overlay.set_alpha(200)
+        self.dim_overlay.fill((0, 0, 0))
+
+        # A board of nothing but hidden cells, every new game starts from a copy of it
+        rows, cols = self.difficulty.rows, self.difficulty.cols
+        self.hidden_board_surface = pygame.Surface((cols * self.cell_size, rows * self.cell_size)).convert()
+        self.hidden_board_surface.fill(BG_COLOR)
+        self.hidden_board_surface.blits([(self.cell_hidden_surf, (col * self.cell_size, row * self.cell_size))
+                                         for row in range(rows) for col in range(cols)], doreturn=False)
+
+        # In-bounds neighbors of every cell, so the flood fill needs no edge checks
+        self.neighbor_offsets, self.neighbors = _neighbor_table(self.difficulty.rows, self.difficulty.cols)
+
+    def render_cell_surface(self, color):
+        size = self.cell_size - 2
+        surface = pygame.Surface((size, size)).convert()
+        surface.fill(BG_COLOR)
+        pygame.draw.rect(surface, color, surface.get_rect(), border_radius=3)
+        return surface
+
+    def render_cell_overlay(self):
+        size = self.cell_size - 2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        return surface
 
     def create_ui_elements(self):
         # Mode buttons
@@ -635,7 +843,7 @@ class MinesweeperGame:
         if self.network and not self.network.game_started:
             self.network.mark_ready()
             self.ready_btn.enabled = False
-            self.ready_btn.text = "Waiting..."
+            self.ready_btn.set_text("Waiting...")
 
     def change_difficulty(self, difficulty):
         # Disable difficulty change in multiplayer
@@ -648,83 +856,86 @@ class MinesweeperGame:
         self.create_ui_elements()
 
     def reset_game(self):
-        # Use network seed if in multiplayer
+        # One generator per game, multiplayer games seed it with the shared network seed
         if self.mode == "multiplayer" and self.network and self.network.board_seed:
-            random.seed(self.network.board_seed)
-
-        self.board = [[Cell(row, col) for col in range(self.difficulty.cols)]
-                      for row in range(self.difficulty.rows)]
+            self.rng = np.random.default_rng(self.network.board_seed)
+        else:
+            self.rng = np.random.default_rng()
+
+        # Board state as one (rows, cols) array per cell attribute
+        shape = (self.difficulty.rows, self.difficulty.cols)
+        self.is_mine = np.zeros(shape, bool)
+        self.is_revealed = np.zeros(shape, bool)
+        self.is_flagged = np.zeros(shape, bool)
+        self.adjacent_mines = np.zeros(shape, np.int8)
+        # Non-mine cells still hidden, the game is won when this reaches zero
+        self.safe_cells_left = self.difficulty.rows * self.difficulty.cols - self.difficulty.mines
         self.game_over = False
         self.game_won = False
         self.first_click = True
         self.start_time = None
         self.elapsed_time = 0
+        # Monotonic clock read once per frame and shared by everything that needs the time
+        self.frame_time = time.monotonic()
         self.flags_placed = 0
         self.hints_remaining = 3
         self.hint_cell = None
         self.hovered_cell = None
         self.score = 0
 
+        # The board surface is rebuilt on the next draw, after that only dirty cells are repainted
+        self.board_surface = None
+        self.dirty_cells = set()
+        self.drawn_hover = None
+        self.drawn_hint = None
+        self.drawn_game_mode = None
+        # What the panels around the board showed in the last full frame, None forces one
+        self.drawn_panel_state = None
+
     def place_mines(self, exclude_row, exclude_col):
-        mines_placed = 0
-        exclude_cells = set()
-
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                r, c = exclude_row + dr, exclude_col + dc
-                if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                    exclude_cells.add((r, c))
-
-        while mines_placed < self.difficulty.mines:
-            row = random.randint(0, self.difficulty.rows - 1)
-            col = random.randint(0, self.difficulty.cols - 1)
-
-            if not self.board[row][col].is_mine and (row, col) not in exclude_cells:
-                self.board[row][col].is_mine = True
-                mines_placed += 1
-
-        # Calculate adjacent mines
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if not self.board[row][col].is_mine:
-                    count = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            r, c = row + dr, col + dc
-                            if 0 <= r < self.difficulty.rows and 0 <= c < self.difficulty.cols:
-                                if self.board[r][c].is_mine:
-                                    count += 1
-                    self.board[row][col].adjacent_mines = count
+        rows, cols = self.difficulty.rows, self.difficulty.cols
+
+        # Mines go anywhere except the first clicked cell and its neighbors, drawn in one go
+        candidates = np.ones((rows, cols), bool)
+        candidates[max(exclude_row - 1, 0):exclude_row + 2, max(exclude_col - 1, 0):exclude_col + 2] = False
+        picks = self.rng.choice(np.flatnonzero(candidates), self.difficulty.mines, replace=False)
+        self.is_mine.flat[picks] = True
+        if self.cheat_mode:
+            # Cheat mode outlines every hidden mine
+            self.mark_dirty(self.is_mine)
+
+        # Calculate adjacent mines: sum the 8 shifted copies of the padded mine mask
+        padded = np.pad(self.is_mine.astype(np.int8), 1)
+        counts = np.zeros((rows, cols), np.int8)
+        for dr, dc in NEIGHBORS8:
+            counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        self.adjacent_mines = np.where(self.is_mine, 0, counts).astype(np.int8)
 
     def reveal_cell(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed or cell.is_flagged:
+        if self.is_revealed[row, col] or self.is_flagged[row, col]:
             return
 
         # In Luck Mode multiplayer, check if it's your turn
         if self.mode == "multiplayer" and self.network and self.game_mode == "luck":
-            display_username = self.get_display_username()
-            if self.network.current_turn and self.network.current_turn != display_username:
+            if self.network.current_turn and self.network.current_turn != self.display_username:
                 return  # Not your turn
 
         # CHEAT MODE: Prevent clicking on mines
-        if self.cheat_mode and cell.is_mine:
+        if self.cheat_mode and self.is_mine[row, col]:
             return
 
-        cell.is_revealed = True
+        self.is_revealed[row, col] = True
+        self.dirty_cells.add((row, col))
 
         if self.first_click:
             self.first_click = False
-            self.start_time = time.time()
+            self.start_time = self.frame_time
             self.place_mines(row, col)
-            cell = self.board[row][col]
 
-        if cell.is_mine:
+        if self.is_mine[row, col]:
             self.game_over = True
             # In Luck Mode, you lose immediately
             if self.game_mode == "luck":
@@ -734,6 +945,8 @@ class MinesweeperGame:
                 self.reveal_all_mines()
             return
 
+        self.safe_cells_left -= 1
+
         # Send action to network if multiplayer
         if self.mode == "multiplayer" and self.network and self.network.game_started:
             self.network.send_action("reveal", row, col)
@@ -744,31 +957,41 @@ class MinesweeperGame:
             pass
         else:
             # Standard mode: flood fill if no adjacent mines
-            if cell.adjacent_mines == 0:
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr == 0 and dc == 0:
-                            continue
-                        self.reveal_cell(row + dr, col + dc)
+            if self.adjacent_mines[row, col] == 0:
+                self.reveal_empty_region(row, col)
 
         self.check_win()
 
+    def reveal_empty_region(self, row, col):
+        # ravel() of the contiguous board arrays is a view, the kernel reveals cells in place
+        opened = _flood_fill(self.is_revealed.ravel(), self.is_flagged.ravel(), self.adjacent_mines.ravel(),
+                             row * self.difficulty.cols + col, self.neighbor_offsets, self.neighbors)
+        rows, cols = np.divmod(opened, self.difficulty.cols)
+        cells = list(zip(rows.tolist(), cols.tolist()))
+        # The flood never opens a mine, every one of these is a safe cell
+        self.safe_cells_left -= len(cells)
+        # The origin reveal has already been sent, every client derives the same board from the
+        # shared seed so the cells the flood opens are not sent one by one
+        self.dirty_cells.update(cells)
+
     def reveal_all_mines(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                if self.board[row][col].is_mine:
-                    self.board[row][col].is_revealed = True
+        self.mark_dirty(self.is_mine & ~self.is_revealed)
+        self.is_revealed |= self.is_mine
+
+    def mark_dirty(self, mask):
+        rows, cols = np.nonzero(mask)
+        self.dirty_cells.update(zip(rows.tolist(), cols.tolist()))
 
     def toggle_flag(self, row, col):
         if row < 0 or row >= self.difficulty.rows or col < 0 or col >= self.difficulty.cols:
             return
 
-        cell = self.board[row][col]
-        if cell.is_revealed:
+        if self.is_revealed[row, col]:
             return
 
-        cell.is_flagged = not cell.is_flagged
-        if cell.is_flagged:
+        self.is_flagged[row, col] = not self.is_flagged[row, col]
+        self.dirty_cells.add((row, col))
+        if self.is_flagged[row, col]:
             self.flags_placed += 1
         else:
             self.flags_placed -= 1
@@ -778,11 +1001,8 @@ class MinesweeperGame:
             self.network.send_action("flag", row, col)
 
     def check_win(self):
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return
+        if self.safe_cells_left > 0:
+            return
 
         self.game_won = True
         self.game_over = True
@@ -819,15 +1039,11 @@ class MinesweeperGame:
             return
 
         # Find a safe cell
-        safe_cells = []
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_revealed and not cell.is_mine and not cell.is_flagged:
-                    safe_cells.append((row, col))
-
-        if safe_cells:
-            self.hint_cell = random.choice(safe_cells)
+        safe_cells = np.argwhere(~self.is_revealed & ~self.is_mine & ~self.is_flagged)
+
+        if len(safe_cells) > 0:
+            row, col = safe_cells[self.rng.integers(len(safe_cells))].tolist()
+            self.hint_cell = (row, col)
             self.hints_remaining -= 1
 
     def auto_win(self):
@@ -837,14 +1053,12 @@ class MinesweeperGame:
 
         # Start timer if not started
         if not self.start_time:
-            self.start_time = time.time()
+            self.start_time = self.frame_time
 
         # Reveal all non-mine cells
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                if not cell.is_mine:
-                    cell.is_revealed = True
+        self.mark_dirty(~self.is_mine & ~self.is_revealed)
+        self.is_revealed |= ~self.is_mine
+        self.safe_cells_left = 0
 
         # Trigger win
         self.check_win()
@@ -867,6 +1081,10 @@ class MinesweeperGame:
 
     def load_leaderboard(self):
         self.leaderboard_file = os.path.join(os.path.dirname(__file__), 'leaderboard.json')
+        # The panel is rendered from the loaded scores on the next draw
+        self.leaderboard_surface = None
+        self.leaderboard_key = None
+        self.leaderboard_version += 1
         try:
             if os.path.exists(self.leaderboard_file):
                 with open(self.leaderboard_file, 'r') as f:
@@ -894,7 +1112,7 @@ class MinesweeperGame:
             return
 
         # Use masked username for leaderboard (cheat mode shows as "Player 1")
-        display_name = self.get_display_username()
+        display_name = self.display_username
 
         entry = {
             "username": display_name,
@@ -912,38 +1130,36 @@ class MinesweeperGame:
         self.leaderboard[diff_name].append(entry)
         self.leaderboard[diff_name].sort(key=lambda x: x['score'], reverse=True)
         self.leaderboard[diff_name] = self.leaderboard[diff_name][:10]
-
-        with open(self.leaderboard_file, 'w') as f:
-            json.dump(self.leaderboard, f, indent=2)
+        self.leaderboard_version += 1
 
         # Also submit to global leaderboard if online
-        if self.mode == "multiplayer" and self.network and self.network.connected:
+        submit = self.mode == "multiplayer" and self.network and self.network.connected
+        snapshot = {name: list(entries) for name, entries in self.leaderboard.items()}
+        self.persist_queue.put((snapshot, entry if submit else None))
+
+    def persist_loop(self):
+        while True:
+            leaderboard, entry = self.persist_queue.get()
             try:
-                requests.post(f"{SERVER_URL}/api/leaderboard/submit", json=entry, timeout=2)
-            except:
-                pass
+                # Write a compact copy next to the file and swap it in, so a crash can't leave it half written
+                tmp_file = self.leaderboard_file + '.tmp'
+                with open(tmp_file, 'w') as f:
+                    json.dump(leaderboard, f, separators=(',', ':'))
+                os.replace(tmp_file, self.leaderboard_file)
+            except OSError as e:
+                print(f"Failed to save leaderboard: {e}")
+
+            if entry is not None:
+                try:
+                    requests.post(f"{SERVER_URL}/api/leaderboard/submit", json=entry, timeout=2)
+                except requests.RequestException:
+                    pass
+            self.persist_queue.task_done()
 
     def draw(self):
-        self.screen.fill(BG_COLOR)
-
-        # Draw title with username
-        if self.cheat_mode:
-            title_text = f"MINESWEEPER - {self.username} 🎮"
-            title_color = CHEAT_COLOR
-        else:
-            title_text = f"MINESWEEPER - {self.username}"
-            title_color = TEXT_COLOR
-
-        title = self.font_large.render(title_text, True, title_color)
-        self.screen.blit(title, (self.padding, self.padding))
-
-        # Draw mode buttons
-        for button in self.buttons:
-            button.draw(self.screen)
-
         # Draw multiplayer info
+        room_text = None
         if self.mode == "multiplayer" and self.network:
-            multi_y = self.padding + 100
             if self.network.room_code:
                 room_text = f"Room: {self.network.room_code}  Players: {len(self.network.players)}/3"
                 if self.network.game_started:
@@ -953,27 +1169,16 @@ class MinesweeperGame:
             else:
                 room_text = "Connecting to room..."
 
-            room_surf = self.font_small.render(room_text, True, BUTTON_COLOR)
-            self.screen.blit(room_surf, (self.padding + 160, multi_y))
-
-        # Draw game info
-        info_y = self.padding + 140
-        mines_left = self.difficulty.mines - self.flags_placed
-
         # Add game mode indicator for Luck Mode
+        turn = None
         if self.game_mode == "luck" and self.mode == "multiplayer" and self.network:
-            display_username = self.get_display_username()
             if self.network.current_turn:
-                if self.network.current_turn == display_username:
-                    turn_text = "🎯 YOUR TURN!"
-                    turn_color = HINT_COLOR
+                if self.network.current_turn == self.display_username:
+                    turn = ("🎯 YOUR TURN!", HINT_COLOR)
                 else:
-                    turn_text = f"⏳ {self.network.current_turn}'s turn"
-                    turn_color = TEXT_COLOR
-                turn_surf = self.font_medium.render(turn_text, True, turn_color)
-                self.screen.blit(turn_surf, (self.padding, info_y))
-                info_y += 28
+                    turn = (f"⏳ {self.network.current_turn}'s turn", TEXT_COLOR)
 
+        mines_left = self.difficulty.mines - self.flags_placed
         info_text = f"Mines: {mines_left}   Time: {self.elapsed_time}s   Hints: {self.hints_remaining}"
 
         if self.game_won:
@@ -981,73 +1186,158 @@ class MinesweeperGame:
         elif self.game_over:
             info_text += "   💥 GAME OVER"
 
-        info_surface = self.font_medium.render(info_text, True, TEXT_COLOR)
+        game_result = self.network.game_result if self.mode == "multiplayer" and self.network else None
+        players_version = self.network.players_version if self.network else None
+        leaderboard_version = self.leaderboard_version
+        buttons = tuple((button.text, button.hovered, button.enabled) for button in self.buttons)
+
+        # Repaint changed cells first, then decide how much of the window has to go out
+        repainted = self.update_board_surface()
+        panel_state = (room_text, turn, info_text, game_result, players_version, leaderboard_version, buttons)
+
+        if panel_state == self.drawn_panel_state and not (repainted and game_result):
+            # Only board cells changed, push just their rects to the display
+            if repainted:
+                self.screen.blit(self.board_surface, (self.padding, self.top_panel_height))
+                rects = [rect.move(self.padding, self.top_panel_height) for rect in repainted]
+                if len(rects) > MAX_UPDATE_RECTS:
+                    rects = [rects[0].unionall(rects[1:])]
+                pygame.display.update(rects)
+            return
+        self.drawn_panel_state = panel_state
+
+        self.screen.fill(BG_COLOR)
+
+        # Draw title with username
+        if self.cheat_mode:
+            title_text = f"MINESWEEPER - {self.username} 🎮"
+            title_color = CHEAT_COLOR
+        else:
+            title_text = f"MINESWEEPER - {self.username}"
+            title_color = TEXT_COLOR
+
+        title = render_text(self.font_large, title_text, title_color)
+        self.screen.blit(title, (self.padding, self.padding))
+
+        # Draw mode buttons
+        for button in self.buttons:
+            button.draw(self.screen)
+
+        if room_text is not None:
+            room_surf = render_text(self.font_small, room_text, BUTTON_COLOR)
+            self.screen.blit(room_surf, (self.padding + 160, self.padding + 100))
+
+        # Draw game info
+        info_y = self.padding + 140
+        if turn is not None:
+            turn_surf = render_text(self.font_medium, *turn)
+            self.screen.blit(turn_surf, (self.padding, info_y))
+            info_y += 28
+
+        info_surface = render_text(self.font_medium, info_text, TEXT_COLOR)
         self.screen.blit(info_surface, (self.padding, info_y))
 
         # Draw game board
-        board_x = self.padding
-        board_y = self.top_panel_height
-
-        for row in range(self.difficulty.rows):
-            for col in range(self.difficulty.cols):
-                cell = self.board[row][col]
-                x = board_x + col * self.cell_size
-                y = board_y + row * self.cell_size
-                rect = pygame.Rect(x, y, self.cell_size - 2, self.cell_size - 2)
-
-                is_hint = self.hint_cell and self.hint_cell == (row, col)
-                is_hovered = self.hovered_cell == (row, col)
-                show_mine_cheat = self.cheat_mode and cell.is_mine and not cell.is_revealed and not cell.is_flagged
-
-                if cell.is_revealed:
-                    pygame.draw.rect(self.screen, CELL_REVEALED, rect, border_radius=3)
-
-                    if cell.is_mine:
-                        pygame.draw.circle(self.screen, MINE_COLOR,
-                                         rect.center, self.cell_size // 4)
-                    elif cell.adjacent_mines > 0 and self.game_mode != "luck":
-                        # Only show numbers in Standard Mode
-                        color = NUMBER_COLORS[cell.adjacent_mines]
-                        text = self.font_medium.render(str(cell.adjacent_mines), True, color)
-                        text_rect = text.get_rect(center=rect.center)
-                        self.screen.blit(text, text_rect)
-                else:
-                    color = CELL_HOVER if is_hovered and not self.game_over else CELL_HIDDEN
-                    pygame.draw.rect(self.screen, color, rect, border_radius=3)
-
-                    if show_mine_cheat:
-                        pygame.draw.rect(self.screen, CHEAT_COLOR, rect, 3, border_radius=3)
-
-                    if is_hint:
-                        pygame.draw.rect(self.screen, HINT_COLOR, rect, 3, border_radius=3)
-
-                    if cell.is_flagged:
-                        flag_points = [
-                            (rect.centerx - 5, rect.centery + 6),
-                            (rect.centerx - 5, rect.centery - 6),
-                            (rect.centerx + 6, rect.centery)
-                        ]
-                        pygame.draw.polygon(self.screen, FLAG_COLOR, flag_points)
-                        pygame.draw.line(self.screen, TEXT_COLOR,
-                                       (rect.centerx - 5, rect.centery - 6),
-                                       (rect.centerx - 5, rect.centery + 6), 2)
+        self.screen.blit(self.board_surface, (self.padding, self.top_panel_height))
 
         # Draw leaderboard panel
         self.draw_leaderboard()
 
         # Draw win/loss overlay if in multiplayer Standard Mode
-        if self.mode == "multiplayer" and self.network and self.network.game_result:
+        if game_result:
             self.draw_game_result_overlay()
 
         pygame.display.flip()
 
+    def update_board_surface(self):
+        """Repaint the cells that changed since the last frame onto the persistent board surface.
+        Returns the repainted cell rects in board coordinates"""
+        size = self.cell_size - 2
+        hover = None if self.game_over else self.hovered_cell
+
+        # Numbers depend on the game mode, which multiplayer only learns when the game starts
+        if self.board_surface is None or self.game_mode != self.drawn_game_mode:
+            # Only cells that look different from a plain hidden one need painting over the copy
+            self.board_surface = self.hidden_board_surface.copy()
+            self.drawn_panel_state = None
+            marked = self.is_revealed | self.is_flagged
+            if self.cheat_mode:
+                marked |= self.is_mine
+            self.dirty_cells.update(map(tuple, np.argwhere(marked).tolist()))
+            self.dirty_cells.update(cell for cell in (hover, self.hint_cell) if cell is not None)
+        else:
+            # Hover and hint outlines only need their old and new cells repainted
+            for drawn, current in ((self.drawn_hover, hover), (self.drawn_hint, self.hint_cell)):
+                if drawn != current:
+                    self.dirty_cells.update(cell for cell in (drawn, current) if cell is not None)
+        self.drawn_hover = hover
+        self.drawn_hint = self.hint_cell
+        self.drawn_game_mode = self.game_mode
+
+        if not self.dirty_cells:
+            return []
+
+        surface = self.board_surface
+        repainted = []
+        sprites = []
+
+        # Plain nested lists index much faster than NumPy scalars in the cell loop
+        is_mine = self.is_mine.tolist()
+        is_revealed = self.is_revealed.tolist()
+        is_flagged = self.is_flagged.tolist()
+        adjacent_mines = self.adjacent_mines.tolist()
+        show_numbers = self.game_mode != "luck"
+
+        # Collect every sprite of every dirty cell, the sprites cover the whole cell so they
+        # fully replace it, and hand them to SDL in one blits() call
+        for row, col in self.dirty_cells:
+            x = col * self.cell_size
+            y = row * self.cell_size
+            repainted.append(pygame.Rect(x, y, size, size))
+
+            if is_revealed[row][col]:
+                if is_mine[row][col]:
+                    sprites.append((self.cell_mine_surf, (x, y)))
+                else:
+                    sprites.append((self.cell_revealed_surf, (x, y)))
+                    # Only show numbers in Standard Mode
+                    if adjacent_mines[row][col] > 0 and show_numbers:
+                        glyph, (dx, dy) = self.number_sprites[adjacent_mines[row][col]]
+                        sprites.append((glyph, (x + dx, y + dy)))
+            else:
+                sprites.append((self.cell_hover_surf if hover == (row, col) else self.cell_hidden_surf, (x, y)))
+
+                if self.cheat_mode and is_mine[row][col] and not is_flagged[row][col]:
+                    sprites.append((self.cheat_outline_surf, (x, y)))
+
+                if self.hint_cell == (row, col):
+                    sprites.append((self.hint_outline_surf, (x, y)))
+
+                if is_flagged[row][col]:
+                    sprites.append((self.flag_surf, (x, y)))
+
+        surface.blits(sprites, doreturn=False)
+        self.dirty_cells.clear()
+        return repainted
+
     def draw_leaderboard(self):
         panel_x = self.padding * 2 + self.difficulty.cols * self.cell_size
         panel_y = self.top_panel_height
+
+        # The panel only changes with the standings, the scores or the difficulty, not from frame to frame
+        key = (self.difficulty, self.network.players_version if self.network else None, self.leaderboard_version)
+        if self.leaderboard_surface is None or key != self.leaderboard_key:
+            self.leaderboard_surface = self.render_leaderboard_panel()
+            self.leaderboard_key = key
+        self.screen.blit(self.leaderboard_surface, (panel_x, panel_y))
+
+    def render_leaderboard_panel(self):
         panel_width = self.right_panel_width
         panel_height = self.difficulty.rows * self.cell_size
+        # Reaches down to the window edge, a full Easy leaderboard runs past the panel background
+        surface = pygame.Surface((panel_width, self.height - self.top_panel_height), pygame.SRCALPHA)
 
-        pygame.draw.rect(self.screen, PANEL_BG, (panel_x, panel_y, panel_width, panel_height), border_radius=5)
+        pygame.draw.rect(surface, PANEL_BG, (0, 0, panel_width, panel_height), border_radius=5)
 
         # Title
         if self.mode == "multiplayer":
@@ -1056,12 +1346,12 @@ class MinesweeperGame:
             title_text = "LEADERBOARD"
 
         title = self.font_medium.render(title_text, True, TEXT_COLOR)
-        title_rect = title.get_rect(centerx=panel_x + panel_width // 2)
-        self.screen.blit(title, (title_rect.x, panel_y + 10))
+        title_rect = title.get_rect(centerx=panel_width // 2)
+        surface.blit(title, (title_rect.x, 10))
 
         # Show multiplayer standings or local leaderboard
         if self.mode == "multiplayer" and self.network and self.network.players:
-            entry_y = panel_y + 50
+            entry_y = 50
 
             sorted_players = sorted(self.network.players,
                                    key=lambda p: p.get('score', 0),
@@ -1089,19 +1379,19 @@ class MinesweeperGame:
                 name_surf = self.font_small.render(name_text, True, color)
                 score_surf = self.font_small.render(score_text, True, TEXT_COLOR)
 
-                self.screen.blit(rank_surf, (panel_x + 10, entry_y))
-                self.screen.blit(name_surf, (panel_x + 35, entry_y))
-                self.screen.blit(score_surf, (panel_x + 150, entry_y))
+                surface.blit(rank_surf, (10, entry_y))
+                surface.blit(name_surf, (35, entry_y))
+                surface.blit(score_surf, (150, entry_y))
 
                 entry_y += 25
         else:
             # Show local leaderboard
             diff_name = self.font_small.render(f"{self.difficulty.display_name} Mode", True, BUTTON_COLOR)
-            diff_rect = diff_name.get_rect(centerx=panel_x + panel_width // 2)
-            self.screen.blit(diff_name, (diff_rect.x, panel_y + 40))
+            diff_rect = diff_name.get_rect(centerx=panel_width // 2)
+            surface.blit(diff_name, (diff_rect.x, 40))
 
             entries = self.leaderboard.get(self.difficulty.display_name, [])
-            entry_y = panel_y + 70
+            entry_y = 70
 
             for i, entry in enumerate(entries[:10]):
                 rank_text = f"{i+1}."
@@ -1112,24 +1402,23 @@ class MinesweeperGame:
                 name_surf = self.font_small.render(username, True, BUTTON_COLOR)
                 score_surf = self.font_small.render(score_text, True, TEXT_COLOR)
 
-                self.screen.blit(rank_surf, (panel_x + 10, entry_y))
-                self.screen.blit(name_surf, (panel_x + 35, entry_y))
-                self.screen.blit(score_surf, (panel_x + 150, entry_y))
+                surface.blit(rank_surf, (10, entry_y))
+                surface.blit(name_surf, (35, entry_y))
+                surface.blit(score_surf, (150, entry_y))
 
                 entry_y += 25
 
             if not entries:
                 no_scores = self.font_small.render("No scores yet!", True, TEXT_COLOR)
-                no_scores_rect = no_scores.get_rect(centerx=panel_x + panel_width // 2)
-                self.screen.blit(no_scores, (no_scores_rect.x, panel_y + 100))
+                no_scores_rect = no_scores.get_rect(centerx=panel_width // 2)
+                surface.blit(no_scores, (no_scores_rect.x, 100))
+
+        return surface.convert_alpha()
 
     def draw_game_result_overlay(self):
         """Draw win/loss overlay for multiplayer games"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.dim_overlay, (0, 0))
 
         # Result text
         if self.network.game_result == "won":
@@ -1142,18 +1431,18 @@ class MinesweeperGame:
             emoji = "💀"
 
         # Draw result
-        font_huge = pygame.font.Font(None, 96)
-        result_surf = font_huge.render(result_text, True, result_color)
+        font_huge = get_font(96)
+        result_surf = render_text(font_huge, result_text, result_color)
         result_rect = result_surf.get_rect(center=(self.width // 2, self.height // 2 - 50))
         self.screen.blit(result_surf, result_rect)
 
         # Draw emoji
-        emoji_surf = font_huge.render(emoji, True, TEXT_COLOR)
+        emoji_surf = render_text(font_huge, emoji, TEXT_COLOR)
         emoji_rect = emoji_surf.get_rect(center=(self.width // 2, self.height // 2 + 50))
         self.screen.blit(emoji_surf, emoji_rect)
 
         # Instructions
-        inst_surf = self.font_medium.render("Press ESC to exit", True, TEXT_COLOR)
+        inst_surf = render_text(self.font_medium, "Press ESC to exit", TEXT_COLOR)
         inst_rect = inst_surf.get_rect(center=(self.width // 2, self.height // 2 + 150))
         self.screen.blit(inst_surf, inst_rect)
 
@@ -1165,11 +1454,15 @@ class MinesweeperGame:
         if self.mode == "multiplayer" and self.network:
             waiting = True
             while waiting and not self.network.game_started:
+                self.frame_time = time.monotonic()
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running = False
                         waiting = False
                         break
+                    if event.type == pygame.VIDEOEXPOSE:
+                        # The window contents were lost, the next draw() has to repaint all of it
+                        self.drawn_panel_state = None
 
                     for button in self.buttons:
                         button.handle_event(event)
@@ -1177,53 +1470,72 @@ class MinesweeperGame:
                 self.draw()
                 clock.tick(60)
 
-            # Sync game mode from network
+            # Sync game mode and board seed from network, the seed only arrives with game_start
             if self.network.game_started:
                 self.game_mode = self.network.game_mode
+                self.rng = np.random.default_rng(self.network.board_seed)
                 print(f"Game started in {self.game_mode} mode")
 
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
+        def on_quit(event):
+            nonlocal running
+            running = False
 
-                button_clicked = False
-                for button in self.buttons:
-                    if button.handle_event(event):
-                        button_clicked = True
-                        break
+        def on_motion(event):
+            for button in self.buttons:
+                button.handle_event(event)
+            row, col = self.get_cell_from_pos(event.pos)
+            self.hovered_cell = (row, col) if row is not None else None
 
-                if event.type == pygame.MOUSEMOTION:
-                    row, col = self.get_cell_from_pos(event.pos)
-                    self.hovered_cell = (row, col) if row is not None else None
-
-                if not button_clicked:
-                    if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
-                        row, col = self.get_cell_from_pos(event.pos)
-                        if row is not None and col is not None:
-                            if event.button == 1:
-                                if self.hint_cell and self.hint_cell == (row, col):
-                                    self.hint_cell = None
-                                self.reveal_cell(row, col)
-                            elif event.button == 3:
-                                self.toggle_flag(row, col)
-
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_F2:
-                        self.reset_game()
-                    elif event.key == pygame.K_h:
-                        self.use_hint()
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
+        def on_click(event):
+            # A click on a button is not passed on to the board
+            for button in self.buttons:
+                if button.handle_event(event):
+                    return
+
+            if not self.game_over:
+                row, col = self.get_cell_from_pos(event.pos)
+                if row is not None and col is not None:
+                    if event.button == 1:
+                        if self.hint_cell and self.hint_cell == (row, col):
+                            self.hint_cell = None
+                        self.reveal_cell(row, col)
+                    elif event.button == 3:
+                        self.toggle_flag(row, col)
+
+        def on_key(event):
+            nonlocal running
+            if event.key == pygame.K_F2:
+                self.reset_game()
+            elif event.key == pygame.K_h:
+                self.use_hint()
+            elif event.key == pygame.K_ESCAPE:
+                running = False
+
+        def on_expose(event):
+            # The window contents were lost, the next draw() has to repaint all of it
+            self.drawn_panel_state = None
+
+        handlers = {pygame.QUIT: on_quit, pygame.MOUSEMOTION: on_motion, pygame.MOUSEBUTTONDOWN: on_click,
+                    pygame.KEYDOWN: on_key, pygame.VIDEOEXPOSE: on_expose}
+
+        while running:
+            self.frame_time = time.monotonic()
+            for event in pygame.event.get():
+                handler = handlers.get(event.type)
+                if handler:
+                    handler(event)
 
             if self.start_time and not self.game_over:
-                self.elapsed_time = int(time.time() - self.start_time)
+                self.elapsed_time = int(self.frame_time - self.start_time)
 
             self.draw()
             clock.tick(60)
 
         pygame.quit()
 
+        # Let a score from the last game reach the file before the process exits
+        self.persist_queue.join()
+
         # Disconnect from server
         if self.network:
             self.network.disconnect()
@@ -1280,9 +1592,7 @@ if __name__ == '__main__':
                         print("Returning to game mode selection...")
                         break
                     else:
-                        # Create game instance to access username masking
-                        temp_game = MinesweeperGame(username, mode="solo")
-                        display_username = temp_game.get_display_username()
+                        display_username = get_display_username(username)
 
                         if lobby_choice == "create":
                             # Game mode selection loop - allows returning to lobby